@@ -3,17 +3,42 @@ import time
 import json
 import re
 import boto3
+from boto3.s3.transfer import TransferConfig
+import io
 import uuid
+import threading
+import queue
+import itertools
+import multiprocessing
+import subprocess
+import shutil
+import sqlite3
+import hashlib
+import csv
+import gzip
+import math
+import bisect
+import unicodedata
 import requests
-from flask import Flask, render_template, request, send_file, flash, redirect, url_for, jsonify
-from werkzeug.utils import secure_filename
+import click
+from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from collections import deque
+from functools import wraps
+from contextlib import contextmanager
+from flask import (Flask, Response, render_template, request, send_file, flash, redirect, url_for, jsonify,
+                   session as flask_session, stream_with_context)
+from werkzeug.datastructures import FileStorage
+from werkzeug.utils import get_content_type, secure_filename
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import PyPDF2
 import docx
-from moviepy.editor import VideoFileClip
 import speech_recognition as sr
-import urllib.request
 from urllib.parse import urlparse
+from pdf_worker import extract_pdf_range, pdf_page_has_images
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -32,6 +57,149 @@ os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
 AWS_PROFILE = "aiu-sso"
 BUCKET_NAME = "language-preserve-demo-bucket-12345"
 
+# Background job pool (translation pipelines run outside the request thread)
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 4))
+JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', 32))
+
+# Transcribe job polling
+TRANSCRIBE_JOB_PREFIX = "transcribe-job-"
+TRANSCRIBE_POLL_MIN_INTERVAL = 2     # seconds between checks once a job is expected to finish
+TRANSCRIBE_POLL_MAX_INTERVAL = 10    # backoff ceiling, and the most a finished job waits to be seen
+TRANSCRIBE_POLL_MAX_PAGES = 5        # list_transcription_jobs pages scanned per status per cycle
+TRANSCRIBE_POLL_DIRECT_JOBS = 2      # due jobs up to this many are looked up one by one instead of listed
+TRANSCRIBE_CLOCK_SKEW = 60           # seconds of slack between local and AWS clocks
+TRANSCRIBE_SPEED_RATIO = 0.3         # rough Transcribe processing time / media duration
+
+# Translation cache
+TRANSLATION_CACHE_PATH = os.environ.get('TRANSLATION_CACHE_PATH', os.path.join('cache', 'translations.sqlite3'))
+TRANSLATION_CACHE_MEMORY_ENTRIES = int(os.environ.get('TRANSLATION_CACHE_MEMORY_ENTRIES', 4096))
+TRANSLATION_CACHE_MAX_BYTES = int(os.environ.get('TRANSLATION_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Curated phrases (flashcards plus community glossaries) answered locally before the cache/providers
+PHRASE_GLOSSARY_PATHS = [path for path in os.environ.get('PHRASE_GLOSSARY_PATHS', '').split(os.pathsep) if path]
+PHRASE_TABLE_MAX_WORDS = 12        # longer inputs skip the phrase table
+PHRASE_TABLE_REFRESH = 60          # seconds between checks for new content
+
+# Long texts are translated as concurrent provider-sized segments
+TRANSLATION_SEGMENT_CHARS = 1500   # keeps the Google GET query and AWS request well under their limits
+TRANSLATION_WORKERS = int(os.environ.get('TRANSLATION_WORKERS', 8))
+
+# Outbound HTTP / AWS client settings
+HTTP_CONNECT_TIMEOUT = 3.05
+HTTP_READ_TIMEOUT = 20
+HTTP_RETRIES = 2
+HTTP_POOL_SIZE = max(16, TRANSLATION_WORKERS * 2)
+
+# Translation provider routing
+TRANSLATION_PROVIDER_ORDER = [
+    name.strip() for name in os.environ.get('TRANSLATION_PROVIDER_ORDER', 'google,aws').split(',') if name.strip()
+]
+BREAKER_FAILURE_THRESHOLD = 3      # consecutive failures before a provider is skipped
+BREAKER_COOLDOWN = 30              # seconds before an open provider gets a half-open probe
+PROVIDER_SLOW_SECONDS = 5.0        # average latency above which a provider is tried last
+TRANSLATION_HEDGE_AFTER = float(os.environ.get('TRANSLATION_HEDGE_AFTER', 0))  # 0 disables hedged requests
+
+# Post-processing fixes for machine translations: (pattern, replacement).
+# Patterns are written in lower case and match regardless of case;
+# replacements are literal text. Rules are tried in order at each position in
+# a single scan, so a fix whose output should feed another rule needs its own
+# combined entry (see 'miz has').
+TRANSLATION_FIXES = [
+    (r'\bmiz has\b', 'we have'),
+    (r'\bmiz\b', 'We'),
+    (r'senses social science', 'Social Sciences'),
+    (r'\bwe has\b', 'we have'),
+    (r'\bi\b', 'I'),
+    (r'\bscis\b', 'SCIS'),
+    (r'\bsuss\b', 'SUSS'),
+    (r'\.\.', '.'),
+    (r' {2,}', ' '),
+]
+
+# Text-to-speech
+POLLY_CHUNK_CHARS = 2500   # Polly has a 3000 character limit, stay conservative
+TTS_WORKERS = int(os.environ.get('TTS_WORKERS', 4))
+TTS_CACHE_FOLDER = os.environ.get('TTS_CACHE_FOLDER', os.path.join('cache', 'tts'))
+TTS_CACHE_MAX_BYTES = int(os.environ.get('TTS_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# URL ingestion
+URL_DOWNLOAD_MAX_BYTES = int(os.environ.get('URL_DOWNLOAD_MAX_BYTES', app.config['MAX_CONTENT_LENGTH']))
+URL_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+URL_RANGE_MIN_BYTES = 8 * 1024 * 1024     # only split downloads larger than this into ranges
+URL_RANGE_PART_BYTES = 4 * 1024 * 1024
+URL_RANGE_WORKERS = 4
+
+# Media handling (ffmpeg)
+FFMPEG_TIMEOUT = 1800
+# Audio codecs Transcribe accepts as-is, mapped to the container they are copied into
+TRANSCRIBE_COPY_CODECS = {'mp3': 'mp3', 'aac': 'm4a', 'flac': 'flac', 'opus': 'ogg'}
+# File extension -> Transcribe MediaFormat
+TRANSCRIBE_MEDIA_FORMATS = {
+    'mp3': 'mp3', 'mp4': 'mp4', 'm4a': 'm4a', 'wav': 'wav',
+    'flac': 'flac', 'ogg': 'ogg', 'amr': 'amr', 'webm': 'webm'
+}
+
+# Opt-in parallel transcription of long media
+TRANSCRIBE_SEGMENT_MINUTES = float(os.environ.get('TRANSCRIBE_SEGMENT_MINUTES', 10))
+TRANSCRIBE_SEGMENT_SEARCH_SECONDS = 30   # how far from each cut point to look for silence
+TRANSCRIBE_SEGMENT_WORKERS = int(os.environ.get('TRANSCRIBE_SEGMENT_WORKERS', 4))
+
+# PDF extraction
+PDF_PROCESS_MIN_PAGES = 40     # PDFs with more pages are extracted on a process pool
+PDF_PAGES_PER_TASK = 16
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Document pipeline (extraction and translation overlap)
+DOCUMENT_UNIT_CHARS = TRANSLATION_SEGMENT_CHARS   # target size of each DOCX/TXT unit
+DOCUMENT_PREFETCH_UNITS = 16                      # bounded queue between extractor and translators
+DOCUMENT_TRANSLATION_WORKERS = int(os.environ.get('DOCUMENT_TRANSLATION_WORKERS', 4))
+
+# Language detection (local identification first, Comprehend only when unsure)
+LANGUAGE_DETECTION_SAMPLE_CHARS = 4000   # characters of input sent to Comprehend
+LANGUAGE_ID_SAMPLE_CHARS = 300        # characters of input the local identifier scores
+LANGUAGE_ID_MIN_CONFIDENCE = float(os.environ.get('LANGUAGE_ID_MIN_CONFIDENCE', 0.5))
+LANGUAGE_ID_MARGIN_SCALE = 20.0       # log-likelihood margin (nats) that maps to ~63% confidence
+LANGUAGE_ID_WORD_BONUS = 10.0         # nats added per word found in LANGUAGE_ID_COMMON_WORDS
+
+# Flashcard and story content store
+CONTENT_DB_PATH = os.environ.get('CONTENT_DB_PATH', os.path.join('data', 'content.sqlite3'))
+FLASHCARDS_PER_PAGE = 24
+STORIES_PER_PAGE = 10
+
+# Stage timing histograms exposed at /metrics (upper bounds in seconds)
+METRICS_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Batch API
+API_MAX_BATCH_ITEMS = int(os.environ.get('API_MAX_BATCH_ITEMS', 20))   # items accepted per request
+API_MAX_TEXT_CHARS = 100000         # longest raw text item
+
+# Rendered page cache
+PAGE_CACHE_SIZE = 256              # rendered pages kept in memory (LRU)
+
+# Artifact downloads
+ARTIFACT_STORAGE = os.environ.get('ARTIFACT_STORAGE', 'local')   # 's3' serves presigned BUCKET_NAME URLs
+ARTIFACT_URL_EXPIRES = 300         # seconds a presigned download URL stays valid
+ARTIFACT_MAX_AGE = 3600            # browser cache lifetime for downloads
+ARTIFACT_GZIP_MIN_BYTES = 1024     # smaller text artifacts are not worth compressing
+
+# Disk cleanup of uploads and outputs
+FILE_TTL_SECONDS = int(os.environ.get('FILE_TTL_SECONDS', 24 * 3600))     # also how long job records are kept
+DISK_QUOTA_BYTES = int(os.environ.get('DISK_QUOTA_BYTES', 5 * 1024 ** 3))
+JANITOR_INTERVAL = int(os.environ.get('JANITOR_INTERVAL', 300))
+
+# Progress events streamed to the results page (SSE)
+PROGRESS_RETENTION = 600      # seconds a finished session's events stay available
+PROGRESS_MAX_EVENTS = 5000    # per session; the oldest events are dropped beyond this
+PROGRESS_HEARTBEAT = 15       # seconds between keep-alive comments on idle streams
+
+# S3 uploads of media for Transcribe
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
 # Amazon Transcribe language codes
 TRANSCRIBE_LANGUAGE_CODES = {
     'english': 'en-US',
@@ -69,6 +237,159 @@ STANDARD_LANGUAGE_CODES = {
 # Reverse mapping for language codes
 LANGUAGE_CODE_TO_NAME = {v: k for k, v in STANDARD_LANGUAGE_CODES.items()}
 
+# Seed text for the Latin-script language profiles used by LanguageIdentifier.
+# Languages with their own script are identified by Unicode range instead.
+LANGUAGE_ID_SEED_TEXT = {
+    'en': (
+        "The people of the village gathered by the river every evening to share stories about their "
+        "ancestors. Children listened while the elders spoke of brave warriors, wise kings and the "
+        "animals of the forest. These stories were not written down; they were passed from one "
+        "generation to the next by word of mouth. Today many of these languages and traditions are "
+        "in danger of being lost, which is why it is important that we record them and teach them "
+        "to young people. When you translate a document, you should think about what the writer "
+        "wanted to say and how the reader will understand it. I would like to learn more about the "
+        "history of this country, and my friends have also shown interest in the culture and food "
+        "of the region. There is a school near the market where students study science, mathematics "
+        "and literature. Could you please tell me where the station is and how much the ticket costs? "
+        "Thank you very much for your help, we have been looking for this place for a long time."
+    ),
+    'ms': (
+        "Penduduk kampung itu berkumpul di tepi sungai setiap petang untuk berkongsi cerita tentang "
+        "nenek moyang mereka. Kanak-kanak mendengar ketika orang tua bercerita tentang pahlawan yang "
+        "berani, raja yang bijaksana dan haiwan di dalam hutan. Cerita-cerita ini tidak ditulis; ia "
+        "diwarisi daripada satu generasi kepada generasi seterusnya secara lisan. Hari ini banyak "
+        "bahasa dan tradisi ini berada dalam bahaya untuk hilang, oleh sebab itu adalah penting untuk "
+        "kita merekodkan dan mengajarnya kepada golongan muda. Apabila anda menterjemah sesuatu "
+        "dokumen, anda perlu memikirkan apa yang ingin disampaikan oleh penulis dan bagaimana pembaca "
+        "akan memahaminya. Saya ingin belajar lebih lanjut tentang sejarah negara ini, dan kawan-kawan "
+        "saya juga berminat dengan budaya serta makanan di kawasan ini. Terdapat sebuah sekolah "
+        "berhampiran pasar di mana pelajar mempelajari sains, matematik dan kesusasteraan. Boleh "
+        "tolong beritahu saya di mana stesen itu dan berapa harga tiketnya? Terima kasih banyak atas "
+        "bantuan anda, kami sudah lama mencari tempat ini. Selamat pagi, apa khabar, nama saya Ali "
+        "dan saya tinggal bersama keluarga yang akan datang ke majlis kenduri kahwin minggu depan."
+    ),
+    'es': (
+        "La gente del pueblo se reunía junto al río todas las tardes para compartir historias sobre "
+        "sus antepasados. Los niños escuchaban mientras los mayores hablaban de guerreros valientes, "
+        "reyes sabios y los animales del bosque. Estas historias no se escribían; se transmitían de "
+        "una generación a la siguiente de forma oral. Hoy muchas de estas lenguas y tradiciones "
+        "están en peligro de perderse, por eso es importante que las registremos y las enseñemos a "
+        "los jóvenes. Cuando traduces un documento, debes pensar en lo que el escritor quería decir "
+        "y en cómo lo entenderá el lector. Me gustaría aprender más sobre la historia de este país, y "
+        "mis amigos también se han interesado por la cultura y la comida de la región. Hay una "
+        "escuela cerca del mercado donde los estudiantes estudian ciencias, matemáticas y literatura. "
+        "¿Podría decirme dónde está la estación y cuánto cuesta el billete? Muchas gracias por su "
+        "ayuda, hemos estado buscando este lugar durante mucho tiempo."
+    ),
+    'fr': (
+        "Les habitants du village se réunissaient au bord de la rivière chaque soir pour partager "
+        "des histoires sur leurs ancêtres. Les enfants écoutaient pendant que les anciens parlaient "
+        "de guerriers courageux, de rois sages et des animaux de la forêt. Ces histoires n'étaient "
+        "pas écrites ; elles étaient transmises d'une génération à l'autre de bouche à oreille. "
+        "Aujourd'hui, beaucoup de ces langues et traditions risquent de disparaître, c'est pourquoi "
+        "il est important que nous les enregistrions et que nous les enseignions aux jeunes. Quand "
+        "vous traduisez un document, vous devez penser à ce que l'auteur voulait dire et à la façon "
+        "dont le lecteur va le comprendre. Je voudrais en apprendre davantage sur l'histoire de ce "
+        "pays, et mes amis se sont aussi intéressés à la culture et à la cuisine de la région. Il y a "
+        "une école près du marché où les élèves étudient les sciences, les mathématiques et la "
+        "littérature. Pourriez-vous me dire où se trouve la gare et combien coûte le billet ? Merci "
+        "beaucoup pour votre aide, nous cherchons cet endroit depuis longtemps."
+    ),
+    'de': (
+        "Die Menschen des Dorfes versammelten sich jeden Abend am Fluss, um Geschichten über ihre "
+        "Vorfahren zu erzählen. Die Kinder hörten zu, während die Älteren von tapferen Kriegern, "
+        "weisen Königen und den Tieren des Waldes sprachen. Diese Geschichten wurden nicht "
+        "aufgeschrieben, sondern mündlich von einer Generation an die nächste weitergegeben. Heute "
+        "sind viele dieser Sprachen und Traditionen in Gefahr, verloren zu gehen, deshalb ist es "
+        "wichtig, dass wir sie aufzeichnen und den jungen Leuten beibringen. Wenn Sie ein Dokument "
+        "übersetzen, sollten Sie darüber nachdenken, was der Autor sagen wollte und wie der Leser es "
+        "verstehen wird. Ich möchte mehr über die Geschichte dieses Landes lernen, und meine Freunde "
+        "haben sich auch für die Kultur und das Essen der Region interessiert. Es gibt eine Schule "
+        "in der Nähe des Marktes, wo die Schüler Naturwissenschaften, Mathematik und Literatur "
+        "studieren. Können Sie mir bitte sagen, wo der Bahnhof ist und wie viel die Fahrkarte "
+        "kostet? Vielen Dank für Ihre Hilfe, wir haben diesen Ort schon lange gesucht."
+    ),
+    'pt': (
+        "As pessoas da aldeia reuniam-se junto ao rio todas as tardes para partilhar histórias sobre "
+        "os seus antepassados. As crianças ouviam enquanto os mais velhos falavam de guerreiros "
+        "corajosos, reis sábios e dos animais da floresta. Estas histórias não eram escritas; eram "
+        "transmitidas de uma geração para a seguinte de forma oral. Hoje muitas destas línguas e "
+        "tradições estão em perigo de se perder, por isso é importante que as registemos e as "
+        "ensinemos aos jovens. Quando você traduz um documento, deve pensar no que o escritor queria "
+        "dizer e em como o leitor vai entendê-lo. Eu gostaria de aprender mais sobre a história deste "
+        "país, e os meus amigos também se interessaram pela cultura e pela comida da região. Há uma "
+        "escola perto do mercado onde os estudantes estudam ciências, matemática e literatura. Você "
+        "poderia me dizer onde fica a estação e quanto custa o bilhete? Muito obrigado pela sua "
+        "ajuda, estamos procurando este lugar há muito tempo e não sabíamos como chegar."
+    ),
+    'it': (
+        "Gli abitanti del villaggio si riunivano vicino al fiume ogni sera per condividere storie "
+        "sui loro antenati. I bambini ascoltavano mentre gli anziani parlavano di guerrieri "
+        "coraggiosi, re saggi e degli animali della foresta. Queste storie non venivano scritte; "
+        "erano tramandate da una generazione all'altra a voce. Oggi molte di queste lingue e "
+        "tradizioni rischiano di andare perdute, per questo è importante che le registriamo e le "
+        "insegniamo ai giovani. Quando traduci un documento, devi pensare a cosa voleva dire "
+        "l'autore e a come il lettore lo capirà. Vorrei imparare di più sulla storia di questo "
+        "paese, e anche i miei amici si sono interessati alla cultura e al cibo della regione. C'è "
+        "una scuola vicino al mercato dove gli studenti studiano scienze, matematica e letteratura. "
+        "Potrebbe dirmi dov'è la stazione e quanto costa il biglietto? Grazie mille per il suo "
+        "aiuto, stavamo cercando questo posto da molto tempo."
+    ),
+}
+
+# Everyday words per Latin-script language. Short inputs carry too few trigrams
+# to separate closely related profiles, so each of these words found in the
+# input adds LANGUAGE_ID_WORD_BONUS to its language's score.
+LANGUAGE_ID_COMMON_WORDS = {
+    'en': (
+        "the a an and or but of to in on at for with from by is are was were be been am i you he she "
+        "it we they me my your his her our their this that these those what where when why how who "
+        "not do does did have has had can could will would please thank thanks hello hi yes no good "
+        "morning night evening later see meet nice time hungry like love want need understand sit "
+        "down going go come here there very much sorry excuse welcome"
+    ),
+    'ms': (
+        "saya aku anda awak kamu dia kami kita mereka ini itu yang dan atau tetapi di ke dari daripada "
+        "untuk dengan pada dalam tidak bukan ada apa mana siapa bila berapa bagaimana kenapa mengapa "
+        "sudah belum akan sedang boleh mahu hendak ingin suka terima kasih selamat pagi petang malam "
+        "tengah hari datang jalan tinggal khabar tolong sila maaf jumpa lagi nama makan minum tidur "
+        "lapar faham tandas rumah duduk pergi banyak sangat juga"
+    ),
+    'es': (
+        "el la los las un una unos unas y o pero de del al en con por para es son está están estás "
+        "estoy soy eres fue ser estar yo tú él ella nosotros ellos me mi mis tu su que qué donde "
+        "dónde cuando cuándo como cómo quién no sí hola gracias buenos buenas días tardes noches "
+        "adiós hasta luego favor llamo quiero tengo hambre hora entiendo mucho gusto esta este casa "
+        "durmiendo bien muy"
+    ),
+    'fr': (
+        "le la les un une des et ou mais de du au aux en dans avec pour par sur est sont suis es "
+        "être avoir ai as a je tu elle nous vous ils elles me moi mon ma mes ton ta son sa ce "
+        "cette que qui quoi où quand comment pourquoi ne pas oui non bonjour bonsoir bonne "
+        "nuit merci beaucoup plaît il au revoir bientôt salut heure faim comprends dort "
+        "maison gare enchanté très bien"
+    ),
+    'de': (
+        "der die das den dem des ein eine einen einem und oder aber von zu zum zur in im mit für "
+        "auf ist sind bin bist war sein haben habe hat ich du er sie es wir ihr mich mir mein meine "
+        "dein was wo wann wie warum wer nicht nein ja bitte danke schön hallo guten gute morgen "
+        "tag abend nacht tschüss bis später spät verstehe hunger geht dir mich freut haus schläft "
+        "setzen sehr gut"
+    ),
+    'pt': (
+        "o a os as um uma e ou mas de do da dos das em no na nos nas com por para é são está estão "
+        "estou sou eu você ele ela nós eles me meu minha seu sua que onde quando como quem não sim "
+        "olá oi obrigado obrigada bom boa dia tarde noite tchau até logo favor fome horas entendo "
+        "vai fica banheiro casa dormindo muito bem"
+    ),
+    'it': (
+        "il lo la i gli le un uno una e o ma di del della dei in nel nella con per su è sono sei "
+        "siamo io tu lui lei noi voi loro mi mio mia tuo tua suo sua che dove quando come chi non "
+        "sì ciao grazie mille buongiorno buonasera buona notte arrivederci dopo favore ore fame "
+        "capisco stai sta bagno casa questa questo dormendo molto bene"
+    ),
+}
+
 # Polly voices by language
 POLLY_VOICES = {
     'en': 'Joanna',
@@ -89,6 +410,14 @@ ALLOWED_DOCUMENT_EXTENSIONS = {'pdf', 'docx', 'txt'}
 ALLOWED_VIDEO_EXTENSIONS = {'mp4', 'mov', 'avi', 'mkv'}
 ALLOWED_IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
 
+# Downloadable outputs: file type -> (output filenames to try, download name, mimetype).
+# Text mimetypes carry no charset here; send_file and publish_artifacts add utf-8.
+ARTIFACTS = {
+    'transcript': (('{}_transcript.txt', '{}_original.txt'), 'transcript.txt', 'text/plain'),
+    'translation': (('{}_translation.txt',), 'translation.txt', 'text/plain'),
+    'audio': (('{}_output.mp3',), 'translated_audio.mp3', 'audio/mpeg'),
+}
+
 # Sample flashcards data for Malay-English
 MALAY_ENGLISH_FLASHCARDS = [
     {'malay': 'selamat pagi', 'english': 'good morning', 'pronunciation': 'suh-lah-maht pah-gee', 'category': 'greetings'},
@@ -177,46 +506,763 @@ the unification of various regions and cultures into one nation.
 # -------------------------
 # AWS clients
 # -------------------------
+AWS_CLIENT_CONFIG = BotoConfig(
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    read_timeout=60,
+    retries={'max_attempts': HTTP_RETRIES + 1, 'mode': 'standard'},
+    max_pool_connections=HTTP_POOL_SIZE,
+)
+
+aws_clients = {}
+aws_clients_lock = threading.Lock()
+
+def get_aws_client(service):
+    """Return the process-wide client for an AWS service, creating it once."""
+    client = aws_clients.get(service)
+    if client is not None:
+        return client
+    # boto3 sessions are not thread-safe, so client construction is serialized
+    with aws_clients_lock:
+        client = aws_clients.get(service)
+        if client is None:
+            if session is None:
+                raise RuntimeError("AWS session is not configured")
+            client = session.client(service, config=AWS_CLIENT_CONFIG)
+            aws_clients[service] = client
+        return client
+
 try:
     session = boto3.Session(profile_name=AWS_PROFILE)
-    s3_client = session.client("s3")
-    transcribe_client = session.client("transcribe")
-    polly_client = session.client("polly")
-    comprehend_client = session.client("comprehend")
-    textract_client = session.client("textract")
+    s3_client = get_aws_client("s3")
+    transcribe_client = get_aws_client("transcribe")
+    polly_client = get_aws_client("polly")
+    comprehend_client = get_aws_client("comprehend")
+    textract_client = get_aws_client("textract")
 except Exception as e:
     print(f"AWS initialization error: {e}")
+    session = None
     s3_client = transcribe_client = polly_client = comprehend_client = textract_client = None
 
 # -------------------------
-# Translation Service
+# HTTP session
 # -------------------------
-class TranslationService:
-    def __init__(self):
-        self.fallback_url = "https://translate.googleapis.com/translate_a/single"
-    
-    def translate_text(self, text, source_lang, target_lang):
+def create_http_session():
+    """Keep-alive session with a pooled adapter and retries for idempotent requests."""
+    http = requests.Session()
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    http.mount('https://', adapter)
+    http.mount('http://', adapter)
+    return http
+
+http_session = create_http_session()
+HTTP_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+# -------------------------
+# Metrics
+# -------------------------
+class Metrics:
+    """
+    Prometheus-style histograms plus gauges read from the app's stats() methods.
+
+    Histograms are keyed by name and label set. Gauge sources are callables
+    registered with register_gauges; they are read at scrape time, so they
+    cost nothing between scrapes.
+    """
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.histograms = {}   # name -> {labels: [bucket counts..., +Inf count, sum]}
+        self.help = {}
+        self.gauges = []       # (prefix, stats callable, label name or None)
+        self.lock = threading.Lock()
+
+    def observe(self, name, value, help_text='', **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            if name not in self.help:
+                self.help[name] = help_text
+            counts = series.get(key)
+            if counts is None:
+                counts = series[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def register_gauges(self, prefix, source, label=None):
         """
-        Translate text using multiple fallback methods
+        Export the numeric values of source() as gauges named languard_<prefix>_<key>.
+        With label, source() returns {label value: stats dict} instead.
         """
-        # Method 1: Try Google Translate API directly
+        self.gauges.append((prefix, source, label))
+
+    def render(self):
+        """Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            histograms = {name: {key: list(counts) for key, counts in series.items()}
+                          for name, series in self.histograms.items()}
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# HELP {name} {self.help.get(name) or name}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, counts in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._labels(key + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(key)} {counts[-1]:.6f}")
+                lines.append(f"{name}_count{self._labels(key)} {cumulative}")
+
+        for prefix, source, label in self.gauges:
+            try:
+                stats = source()
+            except Exception as e:
+                print(f"Metrics source {prefix} failed: {e}")
+                continue
+            # A family's samples must be contiguous, so collect them across label groups first
+            families = {}
+            groups = stats.items() if label else [(None, stats)]
+            for label_value, values in groups:
+                base = ((label, label_value),) if label else ()
+                for field, value in sorted(values.items()):
+                    samples = families.setdefault(field, [])
+                    name = f"languard_{prefix}_{field}"
+                    if isinstance(value, dict):
+                        for sub_key, sub_value in sorted(value.items()):
+                            samples.append(f"{name}{self._labels(base + (('key', sub_key),))} {float(sub_value)}")
+                    elif isinstance(value, str):
+                        samples.append(f"{name}{self._labels(base + ((field, value),))} 1")
+                    elif isinstance(value, (int, float)):
+                        samples.append(f"{name}{self._labels(base)} {float(value)}")
+            for field, samples in sorted(families.items()):
+                if not samples:
+                    continue
+                name = f"languard_{prefix}_{field}"
+                lines.append(f"# HELP {name} {field.replace('_', ' ').capitalize()} from {prefix.replace('_', ' ')} stats")
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(pairs):
+        if not pairs:
+            return ""
+        def escape(value):
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+metrics = Metrics()
+
+# Stage timings of the current request or job, collected for Server-Timing and job records
+timing_sink = threading.local()
+
+def record_stage(stage, seconds, **labels):
+    """Add one stage duration to the histograms and the current thread's timing sink."""
+    metrics.observe('languard_stage_duration_seconds', seconds, 'Time spent in each processing stage',
+                    stage=stage, **labels)
+    stages = getattr(timing_sink, 'stages', None)
+    if stages is not None:
+        stages.append((stage, seconds))
+
+@contextmanager
+def stage_timer(stage, **labels):
+    """Time the enclosed block as stage (successful or not)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started, **labels)
+
+def timed(stage, **labels):
+    """Decorator form of stage_timer."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def summarize_stages(stages):
+    """Total seconds per stage name, in first-seen order."""
+    totals = {}
+    for stage, seconds in stages:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return totals
+
+def start_pipeline_stage(stage):
+    """
+    On a job thread, mark the start of a pipeline stage; the previous stage
+    ends here. Pipeline stages are wall-clock, so a job's stages add up to
+    its duration even when the work inside them fans out to other pools.
+    """
+    phases = getattr(timing_sink, 'phases', None)
+    if phases is not None:
+        phases.append((stage, time.perf_counter()))
+
+def finish_pipeline_stages(file_type):
+    """Close the job thread's last pipeline stage and return {stage: seconds}."""
+    phases = getattr(timing_sink, 'phases', None) or []
+    ends = [started for stage, started in phases[1:]] + [time.perf_counter()]
+    stages = [(stage, end - started) for (stage, started), end in zip(phases, ends)]
+    for stage, seconds in stages:
+        metrics.observe('languard_pipeline_stage_seconds', seconds, 'Wall-clock time of each pipeline stage per job',
+                        file_type=file_type, stage=stage)
+    timing_sink.phases = []
+    return {stage: round(seconds, 4) for stage, seconds in summarize_stages(stages).items()}
+
+# -------------------------
+# Translation Service
+# -------------------------
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n\s*\n')
+SENTENCE_BREAK_PATTERN = re.compile(r'(?<=[.!?\u3002\uff01\uff1f])\s+')
+
+def segment_text(text, max_chars):
+    """
+    Split text into (segment, separator) pairs of at most max_chars.
+
+    Breaks fall on paragraph boundaries first, then sentence ends, then
+    whitespace. Joining every segment + separator reproduces the original text.
+    """
+    pieces = []
+    pos = 0
+    for match in PARAGRAPH_BREAK_PATTERN.finditer(text):
+        _segment_paragraph(text[pos:match.start()], match.group(), max_chars, pieces)
+        pos = match.end()
+    _segment_paragraph(text[pos:], '', max_chars, pieces)
+    return pieces
+
+def _segment_paragraph(paragraph, trailing, max_chars, pieces):
+    # Sentences paired with the whitespace that followed them
+    sentences = []
+    pos = 0
+    for match in SENTENCE_BREAK_PATTERN.finditer(paragraph):
+        sentences.append((paragraph[pos:match.start()], match.group()))
+        pos = match.end()
+    sentences.append((paragraph[pos:], trailing))
+
+    # Hard-split over-long sentences at the last space that fits
+    units = []
+    for sentence, separator in sentences:
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                units.append((sentence[:max_chars], ''))
+                sentence = sentence[max_chars:]
+            else:
+                units.append((sentence[:cut], ' '))
+                sentence = sentence[cut + 1:]
+        units.append((sentence, separator))
+
+    # Pack consecutive units into segments of at most max_chars
+    batch = []
+    size = 0
+    for unit, separator in units:
+        if batch and size + len(unit) > max_chars:
+            pieces.append(_join_units(batch))
+            batch = []
+            size = 0
+        batch.append((unit, separator))
+        size += len(unit) + len(separator)
+    if batch:
+        pieces.append(_join_units(batch))
+
+def _join_units(batch):
+    body = ''.join(unit + separator for unit, separator in batch[:-1]) + batch[-1][0]
+    return body, batch[-1][1]
+
+class TranslationCache:
+    """
+    Content-addressed translation cache keyed by (source, target, sha256(text)).
+
+    Lookups hit an in-process LRU first, then a SQLite file that survives
+    restarts. The SQLite tier is trimmed least-recently-used first once it
+    grows past max_bytes.
+
+    lock only guards the LRU and counters; SQLite I/O runs under db_lock so a
+    slow disk never stalls memory hits. Disk hits queue their last_used bump
+    and the queue is written in one transaction, together with the next put
+    or once touch_batch entries have piled up.
+    """
+
+    touch_batch = 64
+
+    def __init__(self, db_path, memory_entries, max_bytes):
+        self.memory = OrderedDict()
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db_lock = threading.Lock()
+        self.touched = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_bytes = 0
+        self.db = None
         try:
-            return self._google_translate_direct(text, source_lang, target_lang)
+            db_dir = os.path.dirname(db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self.db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, translation TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+            self.disk_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
         except Exception as e:
-            print(f"Google Translate direct failed: {e}")
-        
-        # Method 2: Try AWS Translate (if available)
+            print(f"Translation cache disk tier disabled: {e}")
+            self.db = None
+
+    @staticmethod
+    def make_key(text, source_lang, target_lang):
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{source_lang}:{target_lang}:{digest}"
+
+    def get(self, key):
+        """Return the cached translation for key, or None."""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return self.memory[key]
+
+        row = None
+        if self.db is not None:
+            try:
+                with self.db_lock:
+                    row = self.db.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                print(f"Translation cache read error: {e}")
+
+        with self.lock:
+            if not row:
+                self.misses += 1
+                return None
+            self._remember(key, row[0])
+            self.disk_hits += 1
+            self.touched[key] = time.time()
+            flush = len(self.touched) >= self.touch_batch
+        if flush:
+            self._write()
+        return row[0]
+
+    def put(self, key, translation):
+        with self.lock:
+            self._remember(key, translation)
+        if self.db is not None:
+            self._write(key, translation)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'memory_entries': len(self.memory),
+                'disk_bytes': self.disk_bytes,
+            }
+
+    def _remember(self, key, translation):
+        self.memory[key] = translation
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _write(self, key=None, translation=None):
+        """Flush queued last_used bumps and, if given, store one translation, in a single transaction."""
+        with self.lock:
+            touched, self.touched = self.touched, {}
+        with self.db_lock:
+            try:
+                self.db.execute("BEGIN")
+                if touched:
+                    self.db.executemany("UPDATE translations SET last_used = ? WHERE key = ?",
+                                        [(used, k) for k, used in touched.items()])
+                if key is not None:
+                    size = len(key) + len(translation.encode('utf-8'))
+                    row = self.db.execute("SELECT size FROM translations WHERE key = ?", (key,)).fetchone()
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO translations (key, translation, size, last_used) VALUES (?, ?, ?, ?)",
+                        (key, translation, size, time.time())
+                    )
+                    self.disk_bytes += size - (row[0] if row else 0)
+                    if self.disk_bytes > self.max_bytes:
+                        self._evict()
+                self.db.execute("COMMIT")
+            except sqlite3.Error as e:
+                print(f"Translation cache write error: {e}")
+                try:
+                    # Byte and eviction bookkeeping ran ahead of the rolled-back rows
+                    if self.db.in_transaction:
+                        self.db.execute("ROLLBACK")
+                    self.disk_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+
+    def _evict(self):
+        """Drop least recently used rows until the disk tier is under max_bytes. Caller holds db_lock."""
+        while self.disk_bytes > self.max_bytes:
+            rows = self.db.execute("SELECT key, size FROM translations ORDER BY last_used LIMIT 100").fetchall()
+            if not rows:
+                self.disk_bytes = 0
+                return
+            for key, size in rows:
+                self.db.execute("DELETE FROM translations WHERE key = ?", (key,))
+                self.disk_bytes -= size
+                self.evictions += 1
+                if self.disk_bytes <= self.max_bytes:
+                    return
+
+class CircuitBreaker:
+    """
+    Tracks health for one translation provider.
+
+    After failure_threshold consecutive failures (or one fatal error such as
+    AccessDenied) the breaker opens and the provider is skipped. Once cooldown
+    has passed a single half-open probe is let through; success closes the
+    breaker again, failure re-opens it.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.successes = 0
+        self.failures = 0
+        self.latency_avg = None
+        self.last_error = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may go to this provider now."""
+        with self.lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.time() - self.opened_at >= self.cooldown:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def is_slow(self):
+        return self.latency_avg is not None and self.latency_avg > PROVIDER_SLOW_SECONDS
+
+    def record_success(self, latency):
+        with self.lock:
+            self._observe(latency)
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.state = 'closed'
+            self.probe_in_flight = False
+
+    def record_failure(self, latency, error, fatal=False):
+        with self.lock:
+            self._observe(latency)
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+            if fatal or self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.time()
+            self.probe_in_flight = False
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'successes': self.successes,
+                'failures': self.failures,
+                'latency_avg': self.latency_avg,
+                'last_error': self.last_error,
+                'opened_at': self.opened_at,
+            }
+
+    def _observe(self, latency):
+        # Exponentially weighted moving average of call latency
+        if self.latency_avg is None:
+            self.latency_avg = latency
+        else:
+            self.latency_avg = 0.8 * self.latency_avg + 0.2 * latency
+
+class PhraseTable:
+    """
+    In-process table of curated phrase translations.
+
+    Phrases are normalized (NFKC, casefolded, punctuation dropped) into word
+    tuples and stored in a hash. Only an exact match of the whole normalized
+    input answers; anything else goes to the providers, since glossing
+    phrase by phrase gives word salad. Entries come from a source callable.
+    The table is rebuilt when the source's version changes, and the version
+    is checked at most every refresh seconds.
+    """
+
+    WORD = re.compile(r"\w+(?:'\w+)*")
+    END_PUNCTUATION = re.compile(r'[.!?]+$')
+
+    def __init__(self, max_words=PHRASE_TABLE_MAX_WORDS, refresh=PHRASE_TABLE_REFRESH):
+        self.max_words = max_words
+        self.refresh = refresh
+        self.version_source = None
+        self.entry_source = None
+        self.version = None
+        self.next_check = 0.0
+        self.exact = {}   # (source_lang, target_lang, words) -> translation
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+
+    def set_source(self, version, entries):
+        """
+        version() returns a value that changes whenever entries() would;
+        entries() yields (source_lang, source_text, target_lang, target_text).
+        """
+        self.version_source = version
+        self.entry_source = entries
+        self.next_check = 0.0
+
+    def normalize(self, text):
+        text = unicodedata.normalize('NFKC', text).casefold().replace('\u2019', "'")
+        return tuple(self.WORD.findall(text))
+
+    def lookup(self, text, source_lang, target_lang):
+        """Return the curated translation of text, or None if the table can't answer it."""
+        self._maybe_refresh()
+        words = self.normalize(text)
+        if not words or len(words) > self.max_words:
+            return None
+
+        translation = self.exact.get((source_lang, target_lang, words))
+        with self.lock:
+            self.lookups += 1
+            if translation is not None:
+                self.exact_hits += 1
+        if translation is None:
+            return None
+
+        # Carry over the input's leading capital and closing punctuation
+        stripped = text.strip()
+        if stripped[:1].isupper():
+            translation = translation[:1].upper() + translation[1:]
+        end = self.END_PUNCTUATION.search(stripped)
+        return translation + end.group() if end else translation
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.exact),
+                'version': self.version,
+                'lookups': self.lookups,
+                'exact_hits': self.exact_hits,
+                'hit_rate': round(self.exact_hits / self.lookups, 4) if self.lookups else 0.0,
+            }
+
+    def _maybe_refresh(self):
+        if self.version_source is None or time.monotonic() < self.next_check:
+            return
+        with self.lock:
+            if time.monotonic() < self.next_check:
+                return
+            self.next_check = time.monotonic() + self.refresh
         try:
-            return self._aws_translate(text, source_lang, target_lang)
+            version = self.version_source()
+            if version != self.version:
+                self._rebuild(version)
         except Exception as e:
-            print(f"AWS Translate failed: {e}")
+            print(f"Phrase table refresh failed: {e}")
+
+    def _rebuild(self, version):
+        exact = {}
+        for source_lang, source_text, target_lang, target_text in self.entry_source():
+            words = self.normalize(source_text or '')
+            target_text = (target_text or '').strip()
+            if not source_lang or not target_lang or not words or not target_text:
+                continue
+            # The first (curated) entry for a phrase wins over later glossary entries
+            exact.setdefault((source_lang, target_lang, words), target_text)
+        # Readers keep using the old table until the new one is swapped in
+        self.exact = exact
+        self.version = version
+        print(f"Phrase table loaded {len(exact)} entries (content version {version})")
+
+class TranslationService:
+    # Remote providers by name, mapped to the method that calls them
+    PROVIDERS = {
+        'google': ('_google_translate_direct', 'Google Translate direct'),
+        'aws': ('_aws_translate', 'AWS Translate'),
+    }
+
+    def __init__(self, cache=None, segment_chars=TRANSLATION_SEGMENT_CHARS, max_workers=TRANSLATION_WORKERS,
+                 provider_order=TRANSLATION_PROVIDER_ORDER, hedge_after=TRANSLATION_HEDGE_AFTER, phrases=None):
+        self.fallback_url = "https://translate.googleapis.com/translate_a/single"
+        self.cache = cache
+        self.phrases = phrases
+        self.segment_chars = segment_chars
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+        self.hedge_executor = ThreadPoolExecutor(max_workers=max_workers * 2, thread_name_prefix="translate-hedge")
+        self.provider_order = [name for name in provider_order if name in self.PROVIDERS]
+        self.hedge_after = hedge_after
+        self.breakers = {name: CircuitBreaker(name) for name in self.provider_order}
+        self.decisions = deque(maxlen=50)
+    
+    def translate_text(self, text, source_lang, target_lang, on_segment=None):
+        """
+        Translate text, splitting long texts into segments translated concurrently
+
+        on_segment(translation, separator) is called for each segment in order
+        as soon as it and the segments before it are done.
+        """
+        if len(text) <= self.segment_chars:
+            translation = self._translate_segment(text, source_lang, target_lang)
+            if on_segment is not None:
+                on_segment(translation, '')
+            return translation
+
+        segments = segment_text(text, self.segment_chars)
+        translations = self.executor.map(
+            lambda segment: self._translate_segment(segment, source_lang, target_lang) if segment.strip() else segment,
+            [segment for segment, separator in segments]
+        )
+        parts = []
+        for translation, (segment, separator) in zip(translations, segments):
+            if on_segment is not None:
+                on_segment(translation, separator)
+            parts.append(translation + separator)
+        return ''.join(parts)
+
+    def routing_status(self):
+        """Provider health and recent routing decisions, for ops."""
+        return {
+            'provider_order': self.provider_order,
+            'hedge_after': self.hedge_after,
+            'providers': {name: breaker.snapshot() for name, breaker in self.breakers.items()},
+            'recent_decisions': list(self.decisions),
+            'phrase_table': self.phrases.stats() if self.phrases is not None else None,
+        }
+
+    def _translate_segment(self, text, source_lang, target_lang):
+        """
+        Translate text from the phrase table, the cache, the healthy remote
+        providers, then the fallback
+        """
+        if self.phrases is not None:
+            local = self.phrases.lookup(text, source_lang, target_lang)
+            if local is not None:
+                return local
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(text, source_lang, target_lang)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        translated = self._translate_remote(text, source_lang, target_lang)
+        if translated is not None:
+            if key:
+                self.cache.put(key, translated)
+            return translated
         
-        # Method 3: Simple word mapping fallback (for demo purposes)
+        # Last resort: simple fallback (for demo purposes, never cached)
         try:
             return self._simple_translation_fallback(text, source_lang, target_lang)
         except Exception as e:
             print(f"Fallback translation failed: {e}")
             raise Exception("All translation methods failed")
+
+    def _candidates(self, decision):
+        """Yield providers that may be called in configured order, slow ones last."""
+        ordered = sorted(self.provider_order, key=lambda name: self.breakers[name].is_slow())
+        decision['order'] = ordered
+        for name in ordered:
+            if self.breakers[name].allow():
+                yield name
+            else:
+                decision['skipped'].append(name)
+
+    def _call_provider(self, name, text, source_lang, target_lang):
+        method_name, label = self.PROVIDERS[name]
+        breaker = self.breakers[name]
+        started = time.time()
+        try:
+            with stage_timer('translate_provider', provider=name):
+                translated = getattr(self, method_name)(text, source_lang, target_lang)
+        except Exception as e:
+            print(f"{label} failed: {e}")
+            breaker.record_failure(time.time() - started, e, fatal="AccessDenied" in str(e))
+            raise
+        breaker.record_success(time.time() - started)
+        return translated
+
+    def _translate_remote(self, text, source_lang, target_lang):
+        """Return a provider translation, or None if every provider failed or was skipped."""
+        decision = {'time': time.time(), 'order': [], 'skipped': [], 'failed': [], 'provider': None}
+        candidates = self._candidates(decision)
+        try:
+            if self.hedge_after > 0:
+                return self._translate_hedged(candidates, decision, text, source_lang, target_lang)
+
+            for name in candidates:
+                try:
+                    translated = self._call_provider(name, text, source_lang, target_lang)
+                    decision['provider'] = name
+                    return translated
+                except Exception:
+                    decision['failed'].append(name)
+            return None
+        finally:
+            self.decisions.append(decision)
+
+    def _translate_hedged(self, candidates, decision, text, source_lang, target_lang):
+        """
+        Call the first provider; if it has not answered within hedge_after
+        seconds, race the next one against it and take the first success.
+        """
+        def start_next():
+            name = next(candidates, None)
+            if name is not None:
+                future = self.hedge_executor.submit(self._call_provider, name, text, source_lang, target_lang)
+                in_flight[future] = name
+            return name
+
+        in_flight = {}
+        start_next()
+        hedged = False
+        while in_flight:
+            done, _ = wait(in_flight, timeout=None if hedged else self.hedge_after, return_when=FIRST_COMPLETED)
+            if not done:
+                start_next()
+                hedged = True
+                continue
+            for future in done:
+                name = in_flight.pop(future)
+                try:
+                    translated = future.result()
+                except Exception:
+                    decision['failed'].append(name)
+                    continue
+                decision['provider'] = name
+                return translated
+            if not in_flight:
+                hedged = False
+                start_next()
+        return None
     
     def _google_translate_direct(self, text, source_lang, target_lang):
         """Direct HTTP call to Google Translate"""
@@ -228,7 +1274,7 @@ class TranslationService:
             'q': text
         }
         
-        response = requests.get(self.fallback_url, params=params)
+        response = http_session.get(self.fallback_url, params=params, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
         data = response.json()
@@ -242,7 +1288,7 @@ class TranslationService:
     def _aws_translate(self, text, source_lang, target_lang):
         """Use AWS Translate service"""
         try:
-            translate_client = session.client('translate')
+            translate_client = get_aws_client('translate')
             response = translate_client.translate_text(
                 Text=text,
                 SourceLanguageCode=source_lang,
@@ -266,11 +1312,227 @@ class TranslationService:
         return text
 
 # Initialize translation service
-translation_service = TranslationService()
+translation_cache = TranslationCache(TRANSLATION_CACHE_PATH, TRANSLATION_CACHE_MEMORY_ENTRIES,
+                                     TRANSLATION_CACHE_MAX_BYTES)
+phrase_table = PhraseTable()
+translation_service = TranslationService(cache=translation_cache, phrases=phrase_table)
+
+# -------------------------
+# Transcribe Poller
+# -------------------------
+class TranscribePoller:
+    """
+    Single background thread that tracks every outstanding Transcribe job.
+
+    Instead of one get_transcription_job loop per request, waiting callers are
+    woken through futures. When more than direct_jobs are due at once they are
+    checked together with list_transcription_jobs (one call per status page),
+    paging back only as far as the oldest due job's creation time; fewer are
+    looked up directly. The first check is scheduled from the media duration,
+    capped at max_interval and the deadline, after which the interval backs off
+    exponentially up to max_interval.
+    """
+
+    def __init__(self, min_interval, max_interval, speed_ratio, max_pages, direct_jobs):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.speed_ratio = speed_ratio
+        self.max_pages = max_pages
+        self.direct_jobs = direct_jobs
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.api_calls = 0
+
+    def watch(self, job_name, media_duration=None, timeout=600, created=None):
+        """
+        Track a job. Returns a Future resolved with the job summary when it completes.
+        created is the job's CreationTime if it was started earlier, else now is assumed.
+        """
+        future = Future()
+        now = time.time()
+        expected = media_duration * self.speed_ratio if media_duration else 0
+        # Never sleep past max_interval or the deadline, however long the media
+        first_check = min(max(self.min_interval, expected), self.max_interval, timeout)
+        entry = {
+            'future': future,
+            'next_check': now + first_check,
+            'interval': self.min_interval,
+            'deadline': now + timeout,
+            'created': created.timestamp() if created else now,
+        }
+        with self.lock:
+            self.pending[job_name] = entry
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="transcribe-poller", daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+        return future
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.thread = None
+                    return
+                now = time.time()
+                due = {name for name, entry in self.pending.items() if entry['next_check'] <= now}
+                timeout = min(entry['next_check'] for entry in self.pending.values()) - now
+                oldest = min((self.pending[name]['created'] for name in due), default=now)
+
+            if not due:
+                self.wakeup.wait(timeout=timeout)
+                self.wakeup.clear()
+                continue
+
+            try:
+                statuses = self._fetch_statuses(due, oldest - TRANSCRIBE_CLOCK_SKEW)
+            except Exception as e:
+                print(f"Transcribe poll error: {e}")
+                statuses = {}
+
+            self._resolve(due, statuses)
+
+    def _resolve(self, due, statuses):
+        now = time.time()
+        finished = []
+        with self.lock:
+            for name in due:
+                entry = self.pending.get(name)
+                if entry is None:
+                    continue
+                summary = statuses.get(name)
+                status = summary["TranscriptionJobStatus"] if summary else None
+                if status == "COMPLETED":
+                    finished.append((entry['future'], summary, None))
+                elif status == "FAILED":
+                    error = RuntimeError(f"Transcription job failed: {summary.get('FailureReason')}")
+                    finished.append((entry['future'], None, error))
+                elif now > entry['deadline']:
+                    finished.append((entry['future'], None, TimeoutError("Transcription job timed out.")))
+                else:
+                    entry['next_check'] = min(now + entry['interval'], entry['deadline'])
+                    entry['interval'] = min(entry['interval'] * 1.5, self.max_interval)
+                    continue
+                del self.pending[name]
+
+        for future, summary, error in finished:
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(summary)
+
+    def _fetch_statuses(self, names, since):
+        """Look up finished jobs among names, all created after since (epoch seconds)."""
+        if len(names) <= self.direct_jobs:
+            return self._get_statuses(names)
+
+        statuses = {}
+        remaining = set(names)
+        truncated = False
+        for status in ("COMPLETED", "FAILED"):
+            params = {"Status": status, "JobNameContains": TRANSCRIBE_JOB_PREFIX, "MaxResults": 100}
+            for _ in range(self.max_pages):
+                self.api_calls += 1
+                response = transcribe_client.list_transcription_jobs(**params)
+                summaries = response.get("TranscriptionJobSummaries", [])
+                for summary in summaries:
+                    name = summary["TranscriptionJobName"]
+                    if name in remaining:
+                        statuses[name] = summary
+                        remaining.discard(name)
+                # Jobs are listed newest first; later pages only hold jobs older than any we watch
+                reached_older = bool(summaries) and summaries[-1]["CreationTime"].timestamp() < since
+                if not remaining or reached_older or not response.get("NextToken"):
+                    break
+                params["NextToken"] = response["NextToken"]
+            else:
+                truncated = True
+            if not remaining:
+                break
+
+        # The listing was cut short, so fall back to direct lookups for what is left
+        if truncated:
+            statuses.update(self._get_statuses(remaining))
+        return statuses
+
+    def _get_statuses(self, names):
+        """Look up finished jobs among names with one get_transcription_job call each."""
+        statuses = {}
+        for name in names:
+            self.api_calls += 1
+            try:
+                job = transcribe_client.get_transcription_job(TranscriptionJobName=name)["TranscriptionJob"]
+            except transcribe_client.exceptions.BadRequestException:
+                continue
+            if job["TranscriptionJobStatus"] in ("COMPLETED", "FAILED"):
+                statuses[name] = job
+        return statuses
+
+transcribe_poller = TranscribePoller(TRANSCRIBE_POLL_MIN_INTERVAL, TRANSCRIBE_POLL_MAX_INTERVAL,
+                                     TRANSCRIBE_SPEED_RATIO, TRANSCRIBE_POLL_MAX_PAGES,
+                                     TRANSCRIBE_POLL_DIRECT_JOBS)
 
 # -------------------------
 # Helpers
 # -------------------------
+def ordered_map(executor, fn, items, window):
+    """
+    Like executor.map, but keeps at most window calls in flight and yields
+    results in input order, so memory stays bounded for long inputs.
+    """
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def prefetch(iterable, maxsize):
+    """
+    Consume iterable on a producer thread through a bounded queue, so the
+    producer keeps working while the caller processes earlier items.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+    finished = object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((None, item)):
+                    return
+            put((None, finished))
+        except Exception as e:
+            put((e, None))
+
+    threading.Thread(target=produce, name="prefetch", daemon=True).start()
+    try:
+        while True:
+            error, item = buffer.get()
+            if error is not None:
+                raise error
+            if item is finished:
+                return
+            yield item
+    finally:
+        stopped.set()
+
 def allowed_file(filename, file_type):
     if file_type == 'audio':
         extensions = ALLOWED_AUDIO_EXTENSIONS
@@ -285,8 +1547,17 @@ def allowed_file(filename, file_type):
         
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in extensions
 
+download_executor = ThreadPoolExecutor(max_workers=URL_RANGE_WORKERS * 2, thread_name_prefix="download")
+
+@timed('download')
 def download_file_from_url(url, file_type):
-    """Download file from URL and save it locally"""
+    """
+    Stream a file from URL to disk, capped at URL_DOWNLOAD_MAX_BYTES.
+
+    Large files on servers that accept byte ranges are fetched as parallel
+    range requests. Returns (filepath, filename, sha256 of the content).
+    """
+    filepath = None
     try:
         # Validate URL
         parsed_url = urlparse(url)
@@ -297,49 +1568,232 @@ def download_file_from_url(url, file_type):
         file_ext = os.path.splitext(parsed_url.path)[1] or f".{file_type}"
         filename = f"{uuid.uuid4().hex}{file_ext}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file_janitor.lease(filepath)
         
         # Download the file
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
-        req = urllib.request.Request(url, headers=headers)
+        size, accepts_ranges = _probe_url(url, headers)
         
-        with urllib.request.urlopen(req) as response, open(filepath, 'wb') as out_file:
-            data = response.read()
-            out_file.write(data)
+        digest = hashlib.sha256()
+        partial_path = f"{filepath}.part"
+        try:
+            with open(partial_path, 'wb') as out_file:
+                if accepts_ranges and size >= URL_RANGE_MIN_BYTES:
+                    _download_ranges(url, headers, size, out_file, digest)
+                else:
+                    _download_stream(url, headers, out_file, digest)
+            os.replace(partial_path, filepath)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
         
-        return filepath, filename
+        return filepath, filename, digest.hexdigest()
     except Exception as e:
+        if filepath:
+            file_janitor.discard(filepath)
         raise Exception(f"Failed to download file from URL: {str(e)}")
 
+def _check_download_size(size):
+    if size > URL_DOWNLOAD_MAX_BYTES:
+        raise ValueError(f"File is larger than the {URL_DOWNLOAD_MAX_BYTES // (1024 * 1024)}MB limit")
+
+def _probe_url(url, headers):
+    """HEAD the URL. Returns (content length or 0, whether byte ranges are supported)."""
+    try:
+        response = http_session.head(url, headers=headers, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    except requests.RequestException:
+        return 0, False
+    if not response.ok:
+        return 0, False
+
+    size = int(response.headers.get('Content-Length') or 0)
+    _check_download_size(size)
+    accepts_ranges = (
+        response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        and response.headers.get('Content-Encoding', 'identity') == 'identity'
+    )
+    return size, accepts_ranges
+
+def _download_stream(url, headers, out_file, digest):
+    with http_session.get(url, headers=headers, stream=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        _check_download_size(int(response.headers.get('Content-Length') or 0))
+
+        received = 0
+        for chunk in response.iter_content(chunk_size=URL_DOWNLOAD_CHUNK_BYTES):
+            received += len(chunk)
+            _check_download_size(received)
+            digest.update(chunk)
+            out_file.write(chunk)
+
+def _download_ranges(url, headers, size, out_file, digest):
+    def fetch_part(part):
+        start, end = part
+        part_headers = dict(headers, Range=f"bytes={start}-{end}")
+        response = http_session.get(url, headers=part_headers, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        if response.status_code != 206 or len(response.content) != end - start + 1:
+            raise RuntimeError("Server did not honour the byte range request")
+        return response.content
+
+    parts = [
+        (start, min(start + URL_RANGE_PART_BYTES, size) - 1)
+        for start in range(0, size, URL_RANGE_PART_BYTES)
+    ]
+    # Parts arrive in order, so the hash is computed while writing
+    for data in ordered_map(download_executor, fetch_part, parts, URL_RANGE_WORKERS):
+        digest.update(data)
+        out_file.write(data)
+
+@timed('s3_upload')
 def upload_file_to_s3(local_path: str, bucket: str, key: str):
-    """Upload local file to S3."""
+    """Upload local file to S3, skipping the upload if the key already exists."""
     try:
-        s3_client.upload_file(local_path, bucket, key)
+        if s3_object_exists(bucket, key):
+            return True
+        s3_client.upload_file(local_path, bucket, key, Config=S3_TRANSFER_CONFIG)
         return True
     except Exception as e:
         print(f"Upload error: {e}")
         return False
 
-def wait_for_transcribe_and_get_transcript(bucket: str, job_name: str, timeout=600, poll_interval=5):
-    """Poll for transcription job completion then read the transcript JSON from S3."""
-    started = time.time()
-    while True:
+def s3_object_exists(bucket: str, key: str):
+    try:
+        s3_client.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+
+def file_sha256(path: str):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def artifact_path(file_type: str, session_id: str):
+    """Local path of a session's output artifact, or None if it does not exist."""
+    filenames, display_name, mimetype = ARTIFACTS[file_type]
+    for filename in filenames:
+        path = os.path.join(app.config['OUTPUT_FOLDER'], filename.format(session_id))
+        if os.path.exists(path):
+            return path
+    return None
+
+def artifact_s3_key(file_type: str, session_id: str):
+    return f"artifacts/{session_id}/{ARTIFACTS[file_type][1]}"
+
+def publish_artifacts(session_id: str):
+    """With ARTIFACT_STORAGE=s3, upload a finished session's artifacts to BUCKET_NAME."""
+    if ARTIFACT_STORAGE != 's3':
+        return
+    for file_type, (filenames, display_name, mimetype) in ARTIFACTS.items():
+        path = artifact_path(file_type, session_id)
+        if path is None:
+            continue
         try:
-            status_resp = transcribe_client.get_transcription_job(TranscriptionJobName=job_name)
-            job = status_resp["TranscriptionJob"]
-            status = job["TranscriptionJobStatus"]
-            
-            if status == "COMPLETED":
-                break
-            elif status == "FAILED":
-                raise RuntimeError(f"Transcription job failed: {job.get('FailureReason')}")
-                
-            if time.time() - started > timeout:
-                raise TimeoutError("Transcription job timed out.")
-                
-            time.sleep(poll_interval)
-        except transcribe_client.exceptions.BadRequestException:
-            time.sleep(poll_interval)
+            s3_client.upload_file(path, BUCKET_NAME, artifact_s3_key(file_type, session_id),
+                                  Config=S3_TRANSFER_CONFIG, ExtraArgs={
+                                      'ContentType': get_content_type(mimetype, 'utf-8'),
+                                      'ContentDisposition': f'attachment; filename="{display_name}"',
+                                      'CacheControl': f"private, max-age={ARTIFACT_MAX_AGE}",
+                                  })
+        except Exception as e:
+            print(f"Artifact upload failed, {path} will be served locally: {e}")
+
+def artifact_presigned_url(file_type: str, session_id: str):
+    """Short-lived S3 URL for a published artifact, or None if it was not published."""
+    key = artifact_s3_key(file_type, session_id)
+    try:
+        if not s3_object_exists(BUCKET_NAME, key):
+            return None
+        return s3_client.generate_presigned_url('get_object', Params={'Bucket': BUCKET_NAME, 'Key': key},
+                                                ExpiresIn=ARTIFACT_URL_EXPIRES)
+    except Exception as e:
+        print(f"Presigning {key} failed: {e}")
+        return None
+
+def gzip_artifact(path: str):
+    """Path of a gzip copy of path, written next to it on first use."""
+    gz_path = f"{path}.gz"
+    try:
+        if os.path.getmtime(gz_path) >= os.path.getmtime(path):
+            return gz_path
+    except FileNotFoundError:
+        pass
+
+    # Concurrent requests each write their own temp file; the last rename wins
+    partial_path = f"{gz_path}.{uuid.uuid4().hex}.part"
+    try:
+        with open(path, 'rb') as source, gzip.open(partial_path, 'wb', compresslevel=6) as target:
+            shutil.copyfileobj(source, target)
+        os.replace(partial_path, gz_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    return gz_path
+
+def find_ffmpeg():
+    """Path to an ffmpeg binary: the system one, else the one bundled with imageio-ffmpeg."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        return ffmpeg
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+def probe_media(media_path: str):
+    """Return (duration in seconds or None, first audio codec or None) from ffmpeg's stream info."""
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        return None, None
+    try:
+        result = subprocess.run([ffmpeg, "-hide_banner", "-i", media_path],
+                                capture_output=True, text=True, timeout=30)
+    except Exception:
+        return None, None
+
+    duration = codec = None
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    match = re.search(r"Stream #\S+.*?: Audio: (\w+)", result.stderr)
+    if match:
+        codec = match.group(1)
+    return duration, codec
+
+def probe_media_duration(media_path: str):
+    """Return the media duration in seconds, or None if unknown."""
+    return probe_media(media_path)[0]
 
+def media_format_for(media_path: str):
+    """Transcribe MediaFormat matching the file's extension."""
+    file_ext = os.path.splitext(media_path)[1].lstrip('.').lower()
+    return TRANSCRIBE_MEDIA_FORMATS.get(file_ext, "mp3")
+
+def wait_for_transcribe_and_get_transcript(bucket: str, job_name: str, timeout=600, media_duration=None,
+                                           created=None):
+    """Wait for the transcription job via the shared poller then read the transcript JSON from S3."""
+    summary = transcribe_poller.watch(job_name, media_duration=media_duration, timeout=timeout,
+                                      created=created).result()
+    created, started, completed = (summary.get(field) for field in ('CreationTime', 'StartTime', 'CompletionTime'))
+    if created and started:
+        record_stage('transcribe_queue', (started - created).total_seconds())
+    if started and completed:
+        record_stage('transcribe_processing', (completed - started).total_seconds())
+    if completed:
+        # How long the finished job waited for the poller to notice it
+        record_stage('transcribe_poll_wait', max(0.0, time.time() - completed.timestamp()))
+    return read_transcript(bucket, job_name)
+
+def read_transcript(bucket: str, job_name: str):
+    """Read the transcript text a finished job wrote to S3."""
     transcript_s3_key = f"{job_name}.json"
     
     # Read from S3
@@ -349,124 +1803,507 @@ def wait_for_transcribe_and_get_transcript(bucket: str, job_name: str, timeout=6
     text = data["results"]["transcripts"][0]["transcript"]
     return text
 
+class LanguageIdentifier:
+    """
+    Local language identification for STANDARD_LANGUAGE_CODES.
+
+    Text in Arabic, Devanagari, Hangul, kana, Han or Cyrillic script is
+    identified by counting characters in each Unicode range. Latin-script text
+    is scored against character-trigram profiles built from seed text, plus a
+    fixed bonus for each everyday word of the language, which is what lets two
+    or three word inputs be told apart. Confidence grows with the margin over
+    the runner-up.
+    """
+
+    WORD = re.compile(r'[^\W\d_]+')
+    SCRIPTS = [
+        ('ar', re.compile('[\u0600-\u06ff\u0750-\u077f]')),
+        ('hi', re.compile('[\u0900-\u097f]')),
+        ('ko', re.compile('[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]')),
+        ('ja', re.compile('[\u3040-\u30ff]')),
+        ('zh-CN', re.compile('[\u3400-\u4dbf\u4e00-\u9fff]')),
+        ('ru', re.compile('[\u0400-\u04ff]')),
+    ]
+
+    def __init__(self, seed_text, common_words=None):
+        self.common_words = {code: frozenset(words.split()) for code, words in (common_words or {}).items()}
+        self.profiles = {}
+        for code, text in seed_text.items():
+            counts = Counter(self._trigrams(text))
+            total = sum(counts.values()) + len(counts)
+            # Add-half smoothing; unseen trigrams score as half an occurrence
+            self.profiles[code] = (
+                {gram: math.log((count + 0.5) / total) for gram, count in counts.items()},
+                math.log(0.5 / total),
+            )
+
+    @classmethod
+    def _trigrams(cls, text):
+        return [word[i:i + 3]
+                for word in (f" {word} " for word in cls.WORD.findall(text.lower()))
+                for i in range(len(word) - 2)]
+
+    def identify(self, text):
+        """Return (language_code, confidence), or (None, 0.0) if the text has no letters."""
+        sample = text[:LANGUAGE_ID_SAMPLE_CHARS]
+        words = self.WORD.findall(sample.lower())
+        letters = sum(len(word) for word in words)
+        if not letters:
+            return None, 0.0
+
+        counts = {code: len(pattern.findall(sample)) for code, pattern in self.SCRIPTS}
+        # Japanese mixes kana with Han characters
+        if counts['ja'] and counts['ja'] * 10 >= counts['zh-CN']:
+            counts['ja'] += counts.pop('zh-CN')
+        code, count = max(counts.items(), key=lambda item: item[1])
+        if count * 2 >= letters:
+            # Combining vowel signs (e.g. Devanagari) are in range but not letters
+            return code, min(1.0, count / letters)
+
+        grams = self._trigrams(sample)
+        scores = sorted(
+            (sum(map(profile.get, grams, itertools.repeat(unseen)))
+             + LANGUAGE_ID_WORD_BONUS * sum(word in self.common_words.get(code, ()) for word in words), code)
+            for code, (profile, unseen) in self.profiles.items()
+        )
+        (runner_up, _), (best, code) = scores[-2], scores[-1]
+        return code, 1 - math.exp(-(best - runner_up) / LANGUAGE_ID_MARGIN_SCALE)
+
+language_identifier = LanguageIdentifier(LANGUAGE_ID_SEED_TEXT, LANGUAGE_ID_COMMON_WORDS)
+
+@timed('detect')
 def detect_language(text: str):
-    """Detect the language of the text using Amazon Comprehend."""
+    """
+    Detect the language of the text, returning (code, name, confidence).
+
+    The local identifier answers when it is confident; otherwise a bounded
+    sample is sent to Amazon Comprehend, falling back to the local guess.
+    """
+    lang_code, confidence = language_identifier.identify(text)
+    if lang_code is None or confidence < LANGUAGE_ID_MIN_CONFIDENCE:
+        detected = detect_language_comprehend(text)
+        if detected:
+            return detected
+    if lang_code is None:
+        return 'en', 'english', 0.5
+    return lang_code, LANGUAGE_CODE_TO_NAME[lang_code], confidence
+
+@timed('detect_comprehend')
+def detect_language_comprehend(text: str):
+    """Comprehend's guess for a sample of the text, or None if unavailable or unsupported."""
     try:
-        response = comprehend_client.detect_dominant_language(Text=text)
+        # Comprehend rejects large documents; a sample is enough to detect the language
+        response = comprehend_client.detect_dominant_language(Text=text[:LANGUAGE_DETECTION_SAMPLE_CHARS])
         languages = response['Languages']
-        if languages:
-            top_language = max(languages, key=lambda x: x['Score'])
-            lang_code = top_language['LanguageCode']
-            confidence = top_language['Score']
-            
-            lang_name = LANGUAGE_CODE_TO_NAME.get(lang_code, "unknown")
-            return lang_code, lang_name, confidence
-        return None, "unknown", 0
     except Exception:
-        # Fallback detection
-        if any(word in text.lower() for word in ['the', 'and', 'is', 'are', 'to']):
-            return 'en', 'english', 0.9
-        elif any(word in text.lower() for word in ['dan', 'atau', 'yang', 'di', 'akan']):
-            return 'ms', 'malay', 0.9
-        else:
-            return 'en', 'english', 0.5
+        return None
+    if not languages:
+        return None
+    top_language = max(languages, key=lambda x: x['Score'])
+    lang_code = top_language['LanguageCode']
+    if lang_code.startswith('zh'):
+        lang_code = 'zh-CN'
+    if lang_code not in LANGUAGE_CODE_TO_NAME:
+        return None
+    return lang_code, LANGUAGE_CODE_TO_NAME[lang_code], top_language['Score']
 
-def clean_translation(text: str):
-    """Post-process translation to improve quality."""
-    # Remove incorrectly added periods
-    text = re.sub(r'(\w)\.(\w)', r'\1\2', text)
-    
-    # Common fixes
-    fixes = [
-        (r'\bMiz\b', 'We'),
-        (r'Senses Social Science', 'Social Sciences'),
-        (r'\bwe has\b', 'we have'),
-        (r'\bi\b', 'I'),
-        (r'\bscis\b', 'SCIS'),
-        (r'\bsuss\b', 'SUSS'),
-        (r'\.\.', '.'),
-        (r' +', ' '),
-    ]
-    
-    for pattern, replacement in fixes:
-        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-    
-    # Fix sentence boundaries
-    text = re.sub(r'([a-z])([A-Z])', r'\1. \2', text)
-    
-    # Capitalize sentences
-    sentences = text.split('. ')
-    cleaned_sentences = []
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if sentence:
-            sentence = sentence[0].upper() + sentence[1:]
-            cleaned_sentences.append(sentence)
-    
-    text = '. '.join(cleaned_sentences)
-    
-    if not text.endswith('.'):
-        text += '.'
-        
-    return text
+class TextPostProcessor:
+    """
+    Post-processing for translated text with its rules compiled once.
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF file."""
-    text = ""
-    try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-    except Exception as e:
-        raise RuntimeError(f"PDF extraction failed: {e}")
-    return text
+    Each call is three scans that start on a literal character, which lets re
+    skip ahead in C: stray periods, the fix table, and missing sentence
+    spaces. Sentences are then split, stripped and capitalized in one pass.
+    """
 
-def extract_text_from_docx(docx_path):
-    """Extract text from DOCX file."""
-    try:
-        doc = docx.Document(docx_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text
-    except Exception as e:
-        raise RuntimeError(f"DOCX extraction failed: {e}")
+    # "a.b" -> "ab"; a period whose left neighbour was consumed by the
+    # previous removal is kept ("a.b.c" -> "ab.c")
+    INNER_PERIOD = re.compile(r'\.(?<=\w\.)(?=\w)')
+    # "endNext" -> "end. Next"
+    MISSING_SPACE = re.compile(r'[A-Z](?<=[a-z][A-Z])')
 
-def extract_text_from_image(image_path):
-    """Extract text from image using AWS Textract."""
-    try:
-        with open(image_path, 'rb') as document:
-            image_bytes = bytearray(document.read())
-        
-        response = textract_client.detect_document_text(Document={'Bytes': image_bytes})
-        
-        text = ""
-        for item in response["Blocks"]:
-            if item["BlockType"] == "LINE":
-                text += item["Text"] + "\n"
-                
-        return text
-    except Exception as e:
-        raise RuntimeError(f"Textract failed: {e}")
+    def __init__(self, fixes):
+        # Each rule is wrapped in a group; map that group's number to its replacement
+        self.replacements = {}
+        group = 1
+        for pattern, replacement in fixes:
+            self.replacements[group] = replacement
+            group += re.compile(pattern).groups + 1
+        rules = "|".join(f"({pattern})" for pattern, replacement in fixes)
+        self.rules = re.compile(rules) if fixes else None
+        self.rules_ignorecase = re.compile(rules, re.IGNORECASE) if fixes else None
+        # A leading \b stops re from skipping ahead to the first literal, so
+        # the scan looks for candidates without it and each candidate is
+        # then confirmed against the full rules.
+        scan = "|".join(f"(?:{self._without_leading_boundary(pattern)})" for pattern, replacement in fixes)
+        self.scan = re.compile(scan) if fixes else None
+        self.scan_ignorecase = re.compile(scan, re.IGNORECASE) if fixes else None
 
-def extract_audio_from_video(video_path):
-    """Extract audio from video file."""
-    try:
-        # Create a temporary file for audio
-        audio_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}.wav")
-        
-        # Extract audio using moviepy
-        video = VideoFileClip(video_path)
-        video.audio.write_audiofile(audio_path, verbose=False, logger=None)
-        
-        return audio_path
-    except Exception as e:
-        raise RuntimeError(f"Audio extraction failed: {e}")
+    @staticmethod
+    def _without_leading_boundary(pattern):
+        return pattern[2:] if pattern.startswith(r'\b') else pattern
+
+    def _remove_inner_periods(self, text):
+        removed_at = -2
+
+        def replace(match):
+            nonlocal removed_at
+            if match.start() == removed_at + 2:
+                return '.'
+            removed_at = match.start()
+            return ''
+
+        return self.INNER_PERIOD.sub(replace, text)
+
+    def _apply_fixes(self, text):
+        if self.scan is None:
+            return text
+        # Match against a lower-cased copy; fall back to IGNORECASE for the
+        # rare text whose length changes when lower-cased.
+        subject = text.lower()
+        scan, rules = self.scan, self.rules
+        if len(subject) != len(text):
+            subject, scan, rules = text, self.scan_ignorecase, self.rules_ignorecase
+
+        pieces = []
+        copied = position = 0
+        while True:
+            candidate = scan.search(subject, position)
+            if candidate is None:
+                break
+            start = candidate.start()
+            match = rules.match(subject, start)
+            if match is None:
+                position = start + 1
+                continue
+            pieces.append(text[copied:start])
+            pieces.append(self.replacements[match.lastindex])
+            copied = match.end()
+            position = max(copied, start + 1)
+        pieces.append(text[copied:])
+        return "".join(pieces)
+
+    def process(self, text, terminate=True):
+        text = self._remove_inner_periods(text)
+        text = self._apply_fixes(text)
+        text = self.MISSING_SPACE.sub(r'. \g<0>', text)
+
+        sentences = (sentence.strip() for sentence in text.split('. '))
+        text = '. '.join(sentence[0].upper() + sentence[1:] for sentence in sentences if sentence)
+
+        if terminate and not text.endswith('.'):
+            text += '.'
+        return text
+
+text_post_processor = TextPostProcessor(TRANSLATION_FIXES)
+
+@timed('clean_translation')
+def clean_translation(text: str, terminate=True):
+    """Post-process translation to improve quality."""
+    return text_post_processor.process(text, terminate=terminate)
+
+pdf_process_pool = None
+pdf_process_pool_lock = threading.Lock()
+
+def get_pdf_process_pool():
+    global pdf_process_pool
+    with pdf_process_pool_lock:
+        if pdf_process_pool is None:
+            # spawn, not fork: the web process is multi-threaded
+            pdf_process_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                                   mp_context=multiprocessing.get_context("spawn"))
+        return pdf_process_pool
+
+def iter_pdf_pages(pdf_path):
+    """
+    Yield (page_number, text) for each page, in order, as pages are extracted.
+
+    Small PDFs are read page by page in this thread. Larger ones are split into
+    page ranges extracted on a process pool, with a bounded number of ranges in
+    flight. Pages without a text layer that contain images are treated as
+    scanned and sent to Textract OCR.
+    """
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        page_count = len(reader.pages)
+
+        if page_count < PDF_PROCESS_MIN_PAGES or PDF_WORKERS < 2:
+            for index, page in enumerate(reader.pages):
+                text = page.extract_text() or ""
+                if not text.strip() and pdf_page_has_images(page):
+                    text = ocr_pdf_page(reader, index)
+                yield index + 1, text
+            return
+
+        ranges = [(pdf_path, start, min(start + PDF_PAGES_PER_TASK, page_count))
+                  for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+        index = 0
+        for pages in ordered_map(get_pdf_process_pool(), extract_pdf_range, ranges, PDF_WORKERS * 2):
+            for text, scanned in pages:
+                if scanned:
+                    text = ocr_pdf_page(reader, index)
+                index += 1
+                yield index, text
+
+def ocr_pdf_page(reader, index):
+    """OCR a single scanned PDF page with Textract. Returns "" if OCR is unavailable."""
+    try:
+        writer = PyPDF2.PdfWriter()
+        writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return textract_document_text(buffer.getvalue())
+    except Exception as e:
+        print(f"OCR failed for PDF page {index + 1}: {e}")
+        return ""
+
+def iter_document_units(path, file_ext):
+    """
+    Yield (text, separator) units of a document in order: PDF pages, or DOCX
+    paragraphs and TXT lines grouped to about DOCUMENT_UNIT_CHARS. Joining
+    every text + separator gives the whole document text.
+    """
+    if file_ext == 'pdf':
+        try:
+            for page_number, text in iter_pdf_pages(path):
+                yield text, "\n"
+        except Exception as e:
+            raise RuntimeError(f"PDF extraction failed: {e}")
+    elif file_ext == 'docx':
+        try:
+            doc = docx.Document(path)
+            batch = []
+            size = 0
+            for paragraph in doc.paragraphs:
+                if batch and size + len(paragraph.text) > DOCUMENT_UNIT_CHARS:
+                    yield "\n".join(batch), "\n"
+                    batch = []
+                    size = 0
+                batch.append(paragraph.text)
+                size += len(paragraph.text) + 1
+            if batch:
+                yield "\n".join(batch), ""
+        except Exception as e:
+            raise RuntimeError(f"DOCX extraction failed: {e}")
+    elif file_ext == 'txt':
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = []
+            size = 0
+            for line in f:
+                lines.append(line)
+                size += len(line)
+                # Prefer to break at a blank line, but never let a unit grow unbounded
+                if (size >= DOCUMENT_UNIT_CHARS and not line.strip()) or size >= DOCUMENT_UNIT_CHARS * 2:
+                    yield "".join(lines), ""
+                    lines = []
+                    size = 0
+            if lines:
+                yield "".join(lines), ""
+    else:
+        raise ValueError("Unsupported document format")
+
+def extract_text_from_image(image_path):
+    """Extract text from image using AWS Textract."""
+    try:
+        with open(image_path, 'rb') as document:
+            image_bytes = document.read()
+        return textract_document_text(image_bytes)
+    except Exception as e:
+        raise RuntimeError(f"Textract failed: {e}")
+
+def textract_document_text(document_bytes):
+    """Text lines Textract detects in an image or single-page PDF."""
+    response = textract_client.detect_document_text(Document={'Bytes': document_bytes})
+    return "".join(item["Text"] + "\n" for item in response["Blocks"] if item["BlockType"] == "LINE")
+
+@timed('extract_audio')
+def extract_audio_from_video(video_path):
+    """
+    Demux the audio track from a video with ffmpeg.
+
+    The track is stream-copied when Transcribe accepts its codec, otherwise it
+    is encoded as mono 16 kHz FLAC, which is all Transcribe needs. The file is
+    leased from the janitor; callers discard it when they are done.
+    """
+    try:
+        ffmpeg = find_ffmpeg()
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg is not installed")
+
+        duration, codec = probe_media(video_path)
+        if codec is None:
+            raise RuntimeError("Video has no audio track")
+
+        base_path = os.path.join(app.config['UPLOAD_FOLDER'], uuid.uuid4().hex)
+        if codec in TRANSCRIBE_COPY_CODECS:
+            audio_path = f"{base_path}.{TRANSCRIBE_COPY_CODECS[codec]}"
+            file_janitor.lease(audio_path)
+            try:
+                _run_ffmpeg(ffmpeg, video_path, audio_path, ["-c:a", "copy"])
+                return audio_path
+            except subprocess.CalledProcessError as e:
+                print(f"Audio stream copy failed, re-encoding: {e.stderr}")
+                file_janitor.discard(audio_path)
+
+        audio_path = f"{base_path}.flac"
+        file_janitor.lease(audio_path)
+        try:
+            _run_ffmpeg(ffmpeg, video_path, audio_path, ["-c:a", "flac", "-ac", "1", "-ar", "16000"])
+        except Exception:
+            file_janitor.discard(audio_path)
+            raise
+        return audio_path
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Audio extraction failed: {e.stderr.strip()}")
+    except Exception as e:
+        raise RuntimeError(f"Audio extraction failed: {e}")
+
+def _run_ffmpeg(ffmpeg, input_path, output_path, codec_args):
+    subprocess.run(
+        [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", input_path,
+         "-map", "0:a:0", "-vn", "-sn", "-dn", *codec_args, output_path],
+        check=True, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT
+    )
+
+transcriptions_in_flight = {}
+transcriptions_lock = threading.Lock()
+
+@timed('transcribe')
+def transcribe_audio(audio_path: str, source_lang: str, content_hash=None, segmented=False):
+    """
+    Transcribe audio file.
+
+    With segmented=True, media longer than TRANSCRIBE_SEGMENT_MINUTES is split
+    at silences and the pieces are transcribed as concurrent jobs.
+
+    The S3 key and Transcribe job name are derived from the media's SHA-256 and
+    the language settings, so the same recording is uploaded and transcribed
+    only once: a finished transcript is read back directly and a job already
+    running (in this process or elsewhere) is waited on instead of restarted.
+    """
+    if segmented:
+        duration = probe_media_duration(audio_path)
+        if duration and duration > TRANSCRIBE_SEGMENT_MINUTES * 60 * 1.5:
+            return transcribe_audio_segmented(audio_path, source_lang, duration)
+
+    media_hash = content_hash or file_sha256(audio_path)
+    file_ext = os.path.splitext(audio_path)[1].lstrip('.').lower() or "mp3"
+    job_name = f"{TRANSCRIBE_JOB_PREFIX}{media_hash[:32]}-{source_lang}"
+
+    with transcriptions_lock:
+        future = transcriptions_in_flight.get(job_name)
+        owner = future is None
+        if owner:
+            future = Future()
+            transcriptions_in_flight[job_name] = future
+
+    if not owner:
+        return future.result()
+
+    try:
+        transcribed_text = _transcribe_media(audio_path, source_lang, job_name, f"media/{media_hash}.{file_ext}")
+        future.set_result(transcribed_text)
+        return transcribed_text
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with transcriptions_lock:
+            transcriptions_in_flight.pop(job_name, None)
+
+transcribe_segment_executor = ThreadPoolExecutor(max_workers=TRANSCRIBE_SEGMENT_WORKERS,
+                                                 thread_name_prefix="transcribe-segment")
+
+def transcribe_audio_segmented(audio_path: str, source_lang: str, duration: float):
+    """
+    Transcribe long media as concurrent segments and stitch the text back in order.
+
+    Only the plain transcript text is joined. Segment item timestamps are not
+    shifted by the segment offsets because nothing downstream reads them:
+    read_transcript returns text alone for whole and segmented media alike.
+    Cuts sit in the middle of silences, so segments neither overlap nor split
+    words and a space join loses nothing.
+    """
+    cut_points = find_segment_boundaries(audio_path, duration, TRANSCRIBE_SEGMENT_MINUTES * 60)
+    spans = list(zip(cut_points[:-1], cut_points[1:]))
+
+    def transcribe_span(span):
+        start, end = span
+        segment_path = cut_audio_segment(audio_path, start, end)
+        try:
+            return transcribe_audio(segment_path, source_lang)
+        finally:
+            file_janitor.discard(segment_path)
+
+    texts = transcribe_segment_executor.map(transcribe_span, spans)
+    return ' '.join(text.strip() for text in texts if text.strip())
+
+def find_segment_boundaries(audio_path: str, duration: float, segment_seconds: float):
+    """
+    Cut points (including 0 and duration) roughly every segment_seconds,
+    moved to the middle of the nearest silence so words are not split.
+    """
+    silences = []
+    ffmpeg = find_ffmpeg()
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-hide_banner", "-nostats", "-i", audio_path, "-map", "0:a:0",
+             "-af", "silencedetect=noise=-35dB:d=0.4", "-f", "null", "-"],
+            capture_output=True, text=True, timeout=FFMPEG_TIMEOUT
+        )
+        starts = [float(value) for value in re.findall(r"silence_start: (-?[\d.]+)", result.stderr)]
+        ends = [float(value) for value in re.findall(r"silence_end: ([\d.]+)", result.stderr)]
+        silences = [(start + end) / 2 for start, end in zip(starts, ends)]
+    except Exception as e:
+        print(f"Silence detection failed, cutting at fixed offsets: {e}")
+
+    cut_points = [0.0]
+    target = segment_seconds
+    while target < duration - segment_seconds / 2:
+        nearby = [point for point in silences
+                  if abs(point - target) <= TRANSCRIBE_SEGMENT_SEARCH_SECONDS and point > cut_points[-1]]
+        cut = min(nearby, key=lambda point: abs(point - target)) if nearby else target
+        cut_points.append(cut)
+        target = cut + segment_seconds
+    cut_points.append(duration)
+    return cut_points
+
+def cut_audio_segment(audio_path: str, start: float, end: float):
+    """Write [start, end) of the audio track to a mono 16 kHz FLAC file."""
+    segment_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}.flac")
+    file_janitor.lease(segment_path)
+    try:
+        subprocess.run(
+            [find_ffmpeg(), "-hide_banner", "-loglevel", "error", "-y",
+             "-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-i", audio_path,
+             "-map", "0:a:0", "-c:a", "flac", "-ac", "1", "-ar", "16000", segment_path],
+            check=True, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT
+        )
+    except Exception:
+        file_janitor.discard(segment_path)
+        raise
+    return segment_path
+
+def restart_transcription_job(params):
+    """Delete the job named in params and start it again under the same name."""
+    job_name = params["TranscriptionJobName"]
+    try:
+        transcribe_client.delete_transcription_job(TranscriptionJobName=job_name)
+    except transcribe_client.exceptions.BadRequestException:
+        pass  # already deleted by another worker
+    try:
+        transcribe_client.start_transcription_job(**params)
+    except transcribe_client.exceptions.ConflictException:
+        pass  # another worker restarted it first; wait on that one
+
+def _transcribe_media(audio_path: str, source_lang: str, job_name: str, s3_key: str):
+    # Reuse a transcript from an earlier run of the same media and settings
+    try:
+        if s3_object_exists(BUCKET_NAME, f"{job_name}.json"):
+            return read_transcript(BUCKET_NAME, job_name)
+    except Exception as e:
+        print(f"Transcript lookup failed: {e}")
 
-def transcribe_audio(audio_path: str, source_lang: str):
-    """Transcribe audio file."""
-    job_name = f"transcribe-job-{uuid.uuid4().hex[:8]}"
-    s3_key = f"audio_{job_name}.mp3"
-    
     # Upload to S3
     if not upload_file_to_s3(audio_path, BUCKET_NAME, s3_key):
         raise RuntimeError("Failed to upload audio to S3")
@@ -475,7 +2312,7 @@ def transcribe_audio(audio_path: str, source_lang: str):
     transcribe_params = {
         "TranscriptionJobName": job_name,
         "Media": {"MediaFileUri": f"s3://{BUCKET_NAME}/{s3_key}"},
-        "MediaFormat": "mp3",
+        "MediaFormat": media_format_for(audio_path),
         "OutputBucketName": BUCKET_NAME,
     }
     
@@ -496,136 +2333,1189 @@ def transcribe_audio(audio_path: str, source_lang: str):
         transcribe_params["LanguageOptions"] = list(TRANSCRIBE_LANGUAGE_CODES.values())
     
     try:
-        transcribe_client.start_transcription_job(**transcribe_params)
-        transcribed_text = wait_for_transcribe_and_get_transcript(BUCKET_NAME, job_name)
+        created = None
+        try:
+            transcribe_client.start_transcription_job(**transcribe_params)
+        except transcribe_client.exceptions.ConflictException:
+            # A job with this name exists already. Wait for it, unless it failed or
+            # completed without its transcript still in S3; then replace it under the
+            # same name so later runs of this media find {job_name}.json again
+            job = transcribe_client.get_transcription_job(TranscriptionJobName=job_name)["TranscriptionJob"]
+            created = job.get("CreationTime")
+            status = job["TranscriptionJobStatus"]
+            if status == "FAILED" or (status == "COMPLETED"
+                                      and not s3_object_exists(BUCKET_NAME, f"{job_name}.json")):
+                restart_transcription_job(transcribe_params)
+                created = None
+
+        transcribed_text = wait_for_transcribe_and_get_transcript(
+            BUCKET_NAME, job_name, media_duration=probe_media_duration(audio_path), created=created
+        )
         return transcribed_text
     except Exception as e:
         raise RuntimeError(f"Transcription failed: {e}")
 
-def translate_text(text: str, source_lang: str, target_lang: str):
-    """Translate text using our translation service."""
-    try:
-        translated_text = translation_service.translate_text(text, source_lang, target_lang)
-        return clean_translation(translated_text)
-    except Exception as e:
-        raise RuntimeError(f"Translation failed: {e}")
+@timed('translate')
+def translate_text(text: str, source_lang: str, target_lang: str, terminate=True, on_segment=None):
+    """
+    Translate text using our translation service.
+
+    on_segment, if given, receives each cleaned segment (with its separator)
+    in order as the translation progresses.
+    """
+    def segment_done(translation, separator):
+        on_segment(clean_translation(translation, terminate=False) + separator)
+
+    try:
+        translated_text = translation_service.translate_text(text, source_lang, target_lang,
+                                                             on_segment=segment_done if on_segment else None)
+        return clean_translation(translated_text, terminate=terminate)
+    except Exception as e:
+        raise RuntimeError(f"Translation failed: {e}")
+
+class SpeechCache:
+    """
+    Disk cache of synthesized speech keyed by (normalized text, engine, voice, format).
+
+    Entries are written to a temp file and renamed into place so concurrent
+    workers never see partial audio. Hits refresh the entry's mtime, and the
+    least recently used entries are evicted once the folder exceeds max_bytes.
+    """
+
+    def __init__(self, folder, max_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(folder, exist_ok=True)
+        self.total_bytes = sum(size for path, size, mtime in self._entries())
+
+    @staticmethod
+    def make_key(text, engine, voice, output_format):
+        normalized = ' '.join(unicodedata.normalize('NFC', text).split())
+        payload = f"{engine}\0{voice}\0{output_format}\0{normalized}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def fetch(self, key, output_format, output_path):
+        """Materialize a cached entry at output_path. Returns False on a miss."""
+        path = os.path.join(self.folder, f"{key}.{output_format}")
+        try:
+            _link_or_copy(path, output_path)
+            os.utime(path)
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+            return False
+        with self.lock:
+            self.hits += 1
+        return True
+
+    def store(self, key, output_format, source_path):
+        """Add source_path to the cache under key."""
+        path = os.path.join(self.folder, f"{key}.{output_format}")
+        existed = os.path.exists(path)
+        _link_or_copy(source_path, path)
+        if not existed:
+            with self.lock:
+                self.total_bytes += os.path.getsize(path)
+                if self.total_bytes > self.max_bytes:
+                    self._evict()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'bytes': self.total_bytes,
+            }
+
+    def _entries(self):
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and not entry.name.endswith('.part'):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        # Rescan so entries written by other processes are accounted for
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.total_bytes = sum(size for path, size, mtime in entries)
+        for path, size, mtime in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= size
+            self.evictions += 1
+
+def _link_or_copy(source_path, target_path):
+    """Atomically place source_path at target_path, hard-linking when possible."""
+    partial_path = f"{target_path}.{uuid.uuid4().hex[:8]}.part"
+    try:
+        os.link(source_path, partial_path)
+    except OSError:
+        shutil.copyfile(source_path, partial_path)
+    try:
+        os.replace(partial_path, target_path)
+    except Exception:
+        os.remove(partial_path)
+        raise
+
+speech_cache = SpeechCache(TTS_CACHE_FOLDER, TTS_CACHE_MAX_BYTES)
+tts_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+
+@timed('speech')
+def text_to_speech(text: str, language_code: str, output_path: str):
+    """Convert text to speech, reusing cached audio for text already synthesized."""
+    if language_code in POLLY_VOICES:
+        engine, voice = "polly", POLLY_VOICES[language_code]
+    else:
+        engine, voice = "gtts", language_code
+
+    cache_key = speech_cache.make_key(text, engine, voice, "mp3")
+    if speech_cache.fetch(cache_key, "mp3", output_path):
+        return
+
+    synthesize_speech(text, language_code, output_path)
+
+    try:
+        speech_cache.store(cache_key, "mp3", output_path)
+    except Exception as e:
+        print(f"Speech cache write error: {e}")
+
+def synthesize_speech(text: str, language_code: str, output_path: str):
+    """Synthesize speech with Polly, or gTTS for languages without a Polly voice."""
+    if language_code in POLLY_VOICES:
+        # Use Amazon Polly
+        voice_id = POLLY_VOICES[language_code]
+        
+        # Split into chunks on paragraph/sentence/word boundaries
+        chunks = [segment for segment, separator in segment_text(text, POLLY_CHUNK_CHARS) if segment.strip()]
+        
+        def synthesize(chunk):
+            with stage_timer('tts_chunk', engine='polly'):
+                response = polly_client.synthesize_speech(
+                    Text=chunk,
+                    OutputFormat="mp3",
+                    VoiceId=voice_id
+                )
+                return response["AudioStream"].read()
+        
+        # Synthesize chunks concurrently and stream them to disk in order
+        partial_path = f"{output_path}.part"
+        try:
+            with open(partial_path, "wb") as f:
+                for audio in ordered_map(tts_executor, synthesize, chunks or [text], TTS_WORKERS):
+                    f.write(audio)
+            os.replace(partial_path, output_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+    else:
+        # Use gTTS as fallback
+        try:
+            from gtts import gTTS
+            with stage_timer('tts_chunk', engine='gtts'):
+                tts = gTTS(text=text, lang=language_code, slow=False)
+                tts.save(output_path)
+        except Exception as e:
+            raise RuntimeError(f"Text-to-speech failed: {e}")
+
+# -------------------------
+# File Janitor
+# -------------------------
+class FileJanitor:
+    """
+    Background reaper for the upload and output folders.
+
+    Each sweep removes files older than `ttl`, then evicts the oldest files
+    until the folders fit in `quota` bytes. Files that are leased (in use by a
+    pipeline), that belong to a protected session (a queued or running job),
+    or that are downloads in progress (fresh `.part` files) are never removed.
+    Leases and removals share a lock, so a file leased before it is created
+    cannot be deleted underneath its writer.
+    """
+
+    def __init__(self, folders, ttl, quota, interval):
+        self.folders = folders
+        self.ttl = ttl
+        self.quota = quota
+        self.interval = interval
+        self.leases = Counter()
+        self.sessions = Counter()
+        self.after_sweep = []   # callables run after each sweep
+        self.lock = threading.Lock()
+        self.thread = None
+        self.sweeps = 0
+        self.files_removed = 0
+        self.bytes_reclaimed = {'ttl': 0, 'quota': 0, 'finished': 0}
+        self.bytes_stored = 0
+        self.last_sweep_seconds = 0.0
+
+    def lease(self, path):
+        """Protect path (which may not exist yet) until release() or discard()."""
+        with self.lock:
+            self.leases[os.path.abspath(path)] += 1
+
+    def release(self, path):
+        with self.lock:
+            self._release(os.path.abspath(path))
+
+    def protect(self, session_id):
+        """Protect every file named '<session_id>_*' while its job is pending."""
+        with self.lock:
+            self.sessions[session_id] += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="file-janitor", daemon=True)
+                self.thread.start()
+
+    def unprotect(self, session_id):
+        with self.lock:
+            if self.sessions[session_id] > 1:
+                self.sessions[session_id] -= 1
+            else:
+                del self.sessions[session_id]
+
+    def discard(self, *paths):
+        """Release and delete intermediate files a finished pipeline no longer needs."""
+        for path in paths:
+            if not path:
+                continue
+            path = os.path.abspath(path)
+            with self.lock:
+                self._release(path)
+                if self.leases[path] or self._protected(os.path.basename(path)):
+                    continue
+                self._remove(path, 'finished')
+
+    def stats(self):
+        with self.lock:
+            return {
+                'sweeps': self.sweeps,
+                'files_removed': self.files_removed,
+                'bytes_reclaimed': sum(self.bytes_reclaimed.values()),
+                'bytes_reclaimed_by_reason': dict(self.bytes_reclaimed),
+                'bytes_stored': self.bytes_stored,
+                'quota_bytes': self.quota,
+                'ttl_seconds': self.ttl,
+                'leased_files': len(self.leases),
+                'protected_sessions': len(self.sessions),
+                'last_sweep_seconds': self.last_sweep_seconds,
+            }
+
+    def sweep(self):
+        started = time.perf_counter()
+        now = time.time()
+        entries = []
+        for folder in self.folders:
+            try:
+                with os.scandir(folder) as scan:
+                    for entry in scan:
+                        if entry.is_file(follow_symlinks=False):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, os.path.abspath(entry.path), entry.name, stat.st_size))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+
+        with self.lock:
+            stored = 0
+            remaining = []
+            for mtime, path, name, size in entries:
+                if mtime < now - self.ttl and not self._in_use(path, name):
+                    self._remove(path, 'ttl', size)
+                else:
+                    remaining.append((path, name, size))
+                    stored += size
+
+            for path, name, size in remaining:
+                if stored <= self.quota:
+                    break
+                # A .part file is a download being written; stale ones only expire with the TTL
+                if name.endswith('.part') or self._in_use(path, name):
+                    continue
+                self._remove(path, 'quota', size)
+                stored -= size
+
+            self.bytes_stored = stored
+            self.sweeps += 1
+            self.last_sweep_seconds = time.perf_counter() - started
+
+        for task in self.after_sweep:
+            try:
+                task()
+            except Exception as e:
+                print(f"Janitor task failed: {e}")
+
+    def _run(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Janitor sweep failed: {e}")
+            time.sleep(self.interval)
+
+    def _release(self, path):
+        if self.leases[path] > 1:
+            self.leases[path] -= 1
+        else:
+            del self.leases[path]
+
+    def _protected(self, name):
+        return name.split('_', 1)[0] in self.sessions
+
+    def _in_use(self, path, name):
+        return path in self.leases or self._protected(name)
+
+    def _remove(self, path, reason, size=None):
+        try:
+            if size is None:
+                size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self.files_removed += 1
+        self.bytes_reclaimed[reason] += size
+
+file_janitor = FileJanitor([app.config['UPLOAD_FOLDER'], app.config['OUTPUT_FOLDER']],
+                           FILE_TTL_SECONDS, DISK_QUOTA_BYTES, JANITOR_INTERVAL)
+
+# -------------------------
+# Progress Events
+# -------------------------
+class ProgressBroker:
+    """
+    Per-session progress events for the results page's SSE stream.
+
+    Each session keeps an ordered event log, so a page that connects late or
+    reconnects with Last-Event-ID replays what it missed. A session's log is
+    dropped `retention` seconds after it is closed.
+    """
+
+    def __init__(self, retention=PROGRESS_RETENTION, max_events=PROGRESS_MAX_EVENTS):
+        self.retention = retention
+        self.max_events = max_events
+        self.sessions = {}
+        self.condition = threading.Condition()
+
+    def open(self, session_id):
+        with self.condition:
+            self._prune()
+            self.sessions.setdefault(session_id, {'events': deque(maxlen=self.max_events),
+                                                  'next_id': 1, 'closed_at': None})
+
+    def publish(self, session_id, event, data):
+        """Append an event to the session's log and wake its subscribers."""
+        with self.condition:
+            session = self.sessions.get(session_id)
+            if session is None or session['closed_at'] is not None:
+                return
+            session['events'].append((session['next_id'], event, json.dumps(data)))
+            session['next_id'] += 1
+            self.condition.notify_all()
+
+    def close(self, session_id):
+        """Mark the session finished; subscribers stop after the remaining events."""
+        with self.condition:
+            session = self.sessions.get(session_id)
+            if session is not None and session['closed_at'] is None:
+                session['closed_at'] = time.time()
+                self.condition.notify_all()
+
+    def exists(self, session_id):
+        with self.condition:
+            return session_id in self.sessions
+
+    def subscribe(self, session_id, last_event_id=0, heartbeat=PROGRESS_HEARTBEAT):
+        """
+        Yield (event_id, event, data) after last_event_id until the session is
+        closed, and None after `heartbeat` idle seconds so callers can keep
+        the connection alive.
+        """
+        while True:
+            with self.condition:
+                pending, closed = self._pending(session_id, last_event_id)
+                if not pending and not closed:
+                    self.condition.wait(heartbeat)
+                    pending, closed = self._pending(session_id, last_event_id)
+            if not pending:
+                if closed:
+                    return
+                yield None
+                continue
+            for item in pending:
+                last_event_id = item[0]
+                yield item
+
+    def _pending(self, session_id, last_event_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            return [], True
+        pending = [item for item in session['events'] if item[0] > last_event_id]
+        return pending, session['closed_at'] is not None
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        expired = [session_id for session_id, session in self.sessions.items()
+                   if session['closed_at'] is not None and session['closed_at'] < cutoff]
+        for session_id in expired:
+            del self.sessions[session_id]
+
+progress_broker = ProgressBroker()
+
+def report_progress(session_id, event, **data):
+    """Publish a progress event for session_id (see ProgressBroker)."""
+    if event == 'stage':
+        start_pipeline_stage(data['stage'])
+    progress_broker.publish(session_id, event, data)
+
+# -------------------------
+# Pipelines
+# -------------------------
+def resolve_source_language(text: str, source_lang: str):
+    """Return (source_lang, lang_name, confidence), detecting the language if auto."""
+    if source_lang == "auto":
+        detected_lang, lang_name, confidence = detect_language(text)
+        return detected_lang, lang_name, confidence
+    return source_lang, LANGUAGE_CODE_TO_NAME.get(source_lang, "unknown"), 1.0
+
+def report_language(session_id, lang_name, confidence, target_lang):
+    report_progress(session_id, 'language', source_lang=lang_name, confidence=f"{confidence:.1%}",
+                    target_lang=LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"))
+
+def translate_with_progress(session_id, text, source_lang, target_lang):
+    """Translate text, publishing each translated segment as it completes."""
+    if source_lang == target_lang:
+        report_progress(session_id, 'translation', text=text)
+        return text
+    return translate_text(text, source_lang, target_lang,
+                          on_segment=lambda segment: report_progress(session_id, 'translation', text=segment))
+
+def run_audio_pipeline(session_id, upload_path, file_url, source_lang, target_lang, content_hash=None,
+                       segmented=False):
+    """Transcribe, translate and synthesize an audio file. Returns the results dict."""
+    try:
+        if not upload_path:
+            report_progress(session_id, 'stage', stage='download')
+            upload_path, filename, content_hash = download_file_from_url(file_url, 'audio')
+
+        # Step 1: Transcribe audio
+        report_progress(session_id, 'stage', stage='transcribe')
+        transcribed_text = transcribe_audio(upload_path, source_lang, content_hash=content_hash, segmented=segmented)
+        report_progress(session_id, 'transcript', text=transcribed_text)
+
+        # Step 2: Detect language if auto
+        report_progress(session_id, 'stage', stage='detect')
+        source_lang, lang_name, confidence = resolve_source_language(transcribed_text, source_lang)
+        report_language(session_id, lang_name, confidence, target_lang)
+
+        # Step 3: Translate if needed
+        report_progress(session_id, 'stage', stage='translate')
+        translated_text = translate_with_progress(session_id, transcribed_text, source_lang, target_lang)
+
+        # Step 4: Convert to speech
+        report_progress(session_id, 'stage', stage='speech')
+        output_audio = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_output.mp3")
+        text_to_speech(translated_text, target_lang, output_audio)
+
+        # Step 5: Save text files
+        transcript_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_transcript.txt")
+        translation_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_translation.txt")
+
+        with stage_timer('write'):
+            with open(transcript_file, 'w', encoding='utf-8') as f:
+                f.write(transcribed_text)
+            with open(translation_file, 'w', encoding='utf-8') as f:
+                f.write(translated_text)
+
+        publish_artifacts(session_id)
+
+        return {
+            'session_id': session_id,
+            'source_lang': lang_name,
+            'target_lang': LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"),
+            'confidence': f"{confidence:.1%}",
+            'transcribed_text': transcribed_text,
+            'translated_text': translated_text,
+            'has_translation': source_lang != target_lang,
+            'file_type': 'audio'
+        }
+    finally:
+        # Intermediate files go as soon as the job ends; outputs stay until the janitor expires them
+        file_janitor.unprotect(session_id)
+        file_janitor.discard(upload_path)
+
+document_executor = ThreadPoolExecutor(max_workers=DOCUMENT_TRANSLATION_WORKERS, thread_name_prefix="document")
+
+def run_document_pipeline(session_id, upload_path, file_url, source_lang, target_lang, content_hash=None):
+    """
+    Extract and translate a document. Returns the results dict.
+
+    Extraction runs on a producer thread feeding a bounded queue while units
+    are translated concurrently; both output files are written in document
+    order as units complete.
+    """
+    try:
+        if upload_path:
+            file_ext = upload_path.rsplit('.', 1)[1].lower()
+        else:
+            report_progress(session_id, 'stage', stage='download')
+            upload_path, filename, content_hash = download_file_from_url(file_url, 'document')
+            file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else 'txt'
+
+        if file_ext not in ALLOWED_DOCUMENT_EXTENSIONS:
+            raise ValueError("Unsupported document format")
+
+        report_progress(session_id, 'stage', stage='extract')
+        units = prefetch(iter_document_units(upload_path, file_ext), DOCUMENT_PREFETCH_UNITS)
+
+        # Detect language if auto, from the first units only
+        head = []
+        sample_size = 0
+        for unit in units:
+            head.append(unit)
+            sample_size += len(unit[0])
+            if sample_size >= LANGUAGE_DETECTION_SAMPLE_CHARS:
+                break
+        sample = "".join(text + separator for text, separator in head)
+        report_progress(session_id, 'stage', stage='detect')
+        source_lang, lang_name, confidence = resolve_source_language(sample, source_lang)
+        report_language(session_id, lang_name, confidence, target_lang)
+        units = itertools.chain(head, units)
+
+        def translate_unit(unit):
+            text, separator = unit
+            if source_lang == target_lang or not text.strip():
+                return text, separator, text
+            return text, separator, translate_text(text, source_lang, target_lang, terminate=False)
+
+        # Translate and save files as units complete
+        original_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_original.txt")
+        translation_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_translation.txt")
+        original_parts = []
+        translated_parts = []
+        report_progress(session_id, 'stage', stage='translate')
+
+        with open(original_file, 'w', encoding='utf-8') as original_out, \
+                open(translation_file, 'w', encoding='utf-8') as translation_out:
+            for text, separator, translated in ordered_map(document_executor, translate_unit, units,
+                                                           DOCUMENT_TRANSLATION_WORKERS * 2):
+                original_out.write(text + separator)
+                translation_out.write(translated + separator)
+                original_parts.append(text + separator)
+                translated_parts.append(translated + separator)
+                report_progress(session_id, 'transcript', text=text + separator)
+                report_progress(session_id, 'translation', text=translated + separator)
+
+        extracted_text = "".join(original_parts)
+        translated_text = "".join(translated_parts)
+
+        publish_artifacts(session_id)
+
+        return {
+            'session_id': session_id,
+            'source_lang': lang_name,
+            'target_lang': LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"),
+            'confidence': f"{confidence:.1%}",
+            'transcribed_text': extracted_text,
+            'translated_text': translated_text,
+            'has_translation': source_lang != target_lang,
+            'file_type': 'document'
+        }
+    finally:
+        # Intermediate files go as soon as the job ends; outputs stay until the janitor expires them
+        file_janitor.unprotect(session_id)
+        file_janitor.discard(upload_path)
+
+def run_video_pipeline(session_id, upload_path, file_url, source_lang, target_lang, content_hash=None,
+                       segmented=False):
+    """Extract audio from a video, then transcribe, translate and synthesize it."""
+    audio_path = None
+    try:
+        if not upload_path:
+            report_progress(session_id, 'stage', stage='download')
+            upload_path, filename, content_hash = download_file_from_url(file_url, 'video')
+
+        # Step 1: Extract audio from video
+        report_progress(session_id, 'stage', stage='extract')
+        audio_path = extract_audio_from_video(upload_path)
+
+        # Step 2: Transcribe audio
+        report_progress(session_id, 'stage', stage='transcribe')
+        transcribed_text = transcribe_audio(audio_path, source_lang, segmented=segmented)
+        report_progress(session_id, 'transcript', text=transcribed_text)
+
+        # Step 3: Detect language if auto
+        report_progress(session_id, 'stage', stage='detect')
+        source_lang, lang_name, confidence = resolve_source_language(transcribed_text, source_lang)
+        report_language(session_id, lang_name, confidence, target_lang)
+
+        # Step 4: Translate if needed
+        report_progress(session_id, 'stage', stage='translate')
+        translated_text = translate_with_progress(session_id, transcribed_text, source_lang, target_lang)
+
+        # Step 5: Convert to speech
+        report_progress(session_id, 'stage', stage='speech')
+        output_audio = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_output.mp3")
+        text_to_speech(translated_text, target_lang, output_audio)
+
+        # Step 6: Save text files
+        transcript_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_transcript.txt")
+        translation_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_translation.txt")
+
+        with stage_timer('write'):
+            with open(transcript_file, 'w', encoding='utf-8') as f:
+                f.write(transcribed_text)
+            with open(translation_file, 'w', encoding='utf-8') as f:
+                f.write(translated_text)
+
+        publish_artifacts(session_id)
+
+        return {
+            'session_id': session_id,
+            'source_lang': lang_name,
+            'target_lang': LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"),
+            'confidence': f"{confidence:.1%}",
+            'transcribed_text': transcribed_text,
+            'translated_text': translated_text,
+            'has_translation': source_lang != target_lang,
+            'file_type': 'video'
+        }
+    finally:
+        # Intermediate files go as soon as the job ends; outputs stay until the janitor expires them
+        file_janitor.unprotect(session_id)
+        file_janitor.discard(upload_path, audio_path)
+
+def run_text_pipeline(session_id, text, source_lang, target_lang):
+    """Translate raw text. Returns the results dict."""
+    try:
+        report_progress(session_id, 'stage', stage='detect')
+        source_lang, lang_name, confidence = resolve_source_language(text, source_lang)
+        report_language(session_id, lang_name, confidence, target_lang)
+        report_progress(session_id, 'transcript', text=text)
+
+        report_progress(session_id, 'stage', stage='translate')
+        translated_text = translate_with_progress(session_id, text, source_lang, target_lang)
+
+        original_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_original.txt")
+        translation_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_translation.txt")
+
+        with stage_timer('write'):
+            with open(original_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            with open(translation_file, 'w', encoding='utf-8') as f:
+                f.write(translated_text)
+
+        publish_artifacts(session_id)
+
+        return {
+            'session_id': session_id,
+            'source_lang': lang_name,
+            'target_lang': LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"),
+            'confidence': f"{confidence:.1%}",
+            'transcribed_text': text,
+            'translated_text': translated_text,
+            'has_translation': source_lang != target_lang,
+            'file_type': 'text'
+        }
+    finally:
+        file_janitor.unprotect(session_id)
+
+# -------------------------
+# Job Queue
+# -------------------------
+class JobQueue:
+    """Bounded worker pool that runs translation pipelines off the request thread."""
+
+    def __init__(self, max_workers, max_pending, progress=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="languard-job")
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.jobs = {}
+        self.active = {}   # dedupe key -> job_id of a queued or running job
+        self.lock = threading.Lock()
+        self.finished = threading.Condition(self.lock)
+        self.progress = progress
+
+    def submit(self, job_id, file_type, func, *args, dedupe_key=None, **kwargs):
+        """
+        Queue func(*args, **kwargs) as a job. Returns None if the queue is full.
+
+        If a queued or running job was submitted with the same dedupe_key, a
+        snapshot of that job is returned instead of queuing another.
+        """
+        now = time.time()
+        with self.lock:
+            if dedupe_key is not None and dedupe_key in self.active:
+                return dict(self.jobs[self.active[dedupe_key]])
+            if not self.slots.acquire(blocking=False):
+                return None
+            job = {
+                'job_id': job_id,
+                'file_type': file_type,
+                'status': 'queued',
+                'results': None,
+                'error': None,
+                'created_at': now,
+                'updated_at': now,
+                'dedupe_key': dedupe_key,
+                'timings': None,
+            }
+            self.jobs[job_id] = job
+            if dedupe_key is not None:
+                self.active[dedupe_key] = job_id
+
+        if self.progress is not None:
+            self.progress.open(job_id)
+            self.progress.publish(job_id, 'status', {'status': 'queued', 'error': None})
+        try:
+            self.executor.submit(self._run, job_id, func, args, kwargs)
+        except Exception:
+            self._finish(job_id)
+            raise
+        return job
+
+    def get(self, job_id):
+        """Return a snapshot of the job, or None if it is unknown."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait_any(self, job_ids, timeout=None):
+        """
+        Block until at least one of job_ids has completed or failed, or timeout
+        seconds pass. Returns {job_id: snapshot} for every finished job; the
+        snapshot is None if the job has been pruned.
+        """
+        def done(job_id):
+            job = self.jobs.get(job_id)
+            return job is None or job['status'] in ('completed', 'failed')
+
+        with self.finished:
+            self.finished.wait_for(lambda: any(map(done, job_ids)), timeout)
+            return {job_id: dict(self.jobs[job_id]) if job_id in self.jobs else None
+                    for job_id in job_ids if done(job_id)}
+
+    def prune(self, max_age):
+        """Forget finished jobs last updated more than max_age seconds ago."""
+        cutoff = time.time() - max_age
+        with self.lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job['status'] in ('completed', 'failed') and job['updated_at'] < cutoff]
+            for job_id in expired:
+                del self.jobs[job_id]
+        return len(expired)
+
+    def _update(self, job_id, **fields):
+        with self.lock:
+            job = self.jobs[job_id]
+            job.update(fields)
+            job['updated_at'] = time.time()
+            error = job['error']
+            if job['status'] in ('completed', 'failed'):
+                self.finished.notify_all()
+        if self.progress is not None and 'status' in fields:
+            self.progress.publish(job_id, 'status', {'status': fields['status'], 'error': error})
+
+    def _run(self, job_id, func, args, kwargs):
+        with self.lock:
+            file_type = self.jobs[job_id]['file_type']
+            waited = time.time() - self.jobs[job_id]['created_at']
+        metrics.observe('languard_job_wait_seconds', waited, 'Time jobs spend queued before a worker picks them up',
+                        file_type=file_type)
+        self._update(job_id, status='running')
+        timing_sink.phases = []
+        started = time.perf_counter()
+        status = 'failed'
+        try:
+            results = func(*args, **kwargs)
+            status = 'completed'
+            self._update(job_id, status='completed', results=results, timings=finish_pipeline_stages(file_type))
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            self._update(job_id, status='failed', error=str(e), timings=finish_pipeline_stages(file_type))
+        finally:
+            timing_sink.phases = None
+            metrics.observe('languard_job_duration_seconds', time.perf_counter() - started,
+                            'Time from a worker starting a job to its completion', file_type=file_type, status=status)
+            self._finish(job_id)
+
+    def stats(self):
+        with self.lock:
+            statuses = Counter(job['status'] for job in self.jobs.values())
+        return {'queued': statuses['queued'], 'running': statuses['running'],
+                'completed': statuses['completed'], 'failed': statuses['failed']}
+
+    def _finish(self, job_id):
+        with self.lock:
+            dedupe_key = self.jobs[job_id]['dedupe_key']
+            if dedupe_key is not None and self.active.get(dedupe_key) == job_id:
+                del self.active[dedupe_key]
+        self.slots.release()
+        if self.progress is not None:
+            self.progress.close(job_id)
+
+# Initialize job queue
+job_queue = JobQueue(JOB_WORKERS, JOB_QUEUE_SIZE, progress=progress_broker)
+# Job records go when their output files do
+file_janitor.after_sweep.append(lambda: job_queue.prune(FILE_TTL_SECONDS))
+
+# -------------------------
+# Content Store
+# -------------------------
+class ContentStore:
+    """
+    SQLite store for flashcards and stories.
+
+    Each kind of content is a table with a category index and an FTS5 index
+    over its text fields, used for full-text and prefix search. If FTS5 is not
+    compiled into SQLite, search falls back to LIKE. Every import bumps a
+    version counter that callers can use to invalidate anything derived from
+    the content.
+
+    Another backend can replace this one by providing the same methods:
+    query, categories, iter_records, import_records and version.
+    """
+
+    KINDS = {
+        'flashcards': {
+            'fields': ('malay', 'english', 'pronunciation', 'category'),
+            'required': ('malay', 'english', 'category'),
+            'search': ('malay', 'english', 'pronunciation'),
+            'unique': ('malay', 'english', 'category'),
+        },
+        'stories': {
+            'fields': ('title', 'malay_title', 'content', 'english_translation', 'category'),
+            'required': ('title', 'content', 'category'),
+            'search': ('title', 'malay_title', 'content', 'english_translation'),
+            'unique': ('title', 'category'),
+        },
+    }
+
+    def __init__(self, db_path, seed=None):
+        self.lock = threading.Lock()
+        self.categories_cache = {}
+        try:
+            db_dir = os.path.dirname(db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self.db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+        except (OSError, sqlite3.Error) as e:
+            print(f"Content store at {db_path} unavailable, using memory: {e}")
+            self.db = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.fts = self._create_schema()
 
-def text_to_speech(text: str, language_code: str, output_path: str):
-    """Convert text to speech."""
-    if language_code in POLLY_VOICES:
-        # Use Amazon Polly
-        voice_id = POLLY_VOICES[language_code]
-        
-        # Split into chunks (Polly has a 3000 character limit)
-        max_chunk_size = 2500  # Conservative limit
-        if len(text) > max_chunk_size:
-            # Simple sentence-based splitting
-            sentences = text.split('. ')
-            chunks = []
-            current_chunk = ""
-            
-            for sentence in sentences:
-                if len(current_chunk) + len(sentence) < max_chunk_size:
-                    current_chunk += sentence + ". "
-                else:
-                    if current_chunk:
-                        chunks.append(current_chunk)
-                    current_chunk = sentence + ". "
-            
-            if current_chunk:
-                chunks.append(current_chunk)
-        else:
-            chunks = [text]
-        
-        # Process chunks
-        audio_data = b''
-        for chunk in chunks:
-            response = polly_client.synthesize_speech(
-                Text=chunk,
-                OutputFormat="mp3",
-                VoiceId=voice_id
+        for kind, records in (seed or {}).items():
+            if not self.db.execute(f"SELECT 1 FROM {kind} LIMIT 1").fetchone():
+                self.import_records(kind, records)
+
+    def _create_schema(self):
+        self.db.execute("CREATE TABLE IF NOT EXISTS content_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.db.execute("INSERT OR IGNORE INTO content_meta (key, value) VALUES ('version', 0)")
+        fts = True
+        for kind, spec in self.KINDS.items():
+            columns = ", ".join(f"{field} TEXT NOT NULL DEFAULT ''" for field in spec['fields'])
+            self.db.execute(
+                f"CREATE TABLE IF NOT EXISTS {kind} (id INTEGER PRIMARY KEY, {columns}, "
+                f"UNIQUE ({', '.join(spec['unique'])}))"
             )
-            audio_data += response["AudioStream"].read()
-        
-        with open(output_path, "wb") as f:
-            f.write(audio_data)
-    else:
-        # Use gTTS as fallback
-        try:
-            from gtts import gTTS
-            tts = gTTS(text=text, lang=language_code, slow=False)
-            tts.save(output_path)
-        except Exception as e:
-            raise RuntimeError(f"Text-to-speech failed: {e}")
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS {kind}_category ON {kind} (category, id)")
+            try:
+                self._create_fts(kind, spec['search'])
+            except sqlite3.OperationalError as e:
+                print(f"Full-text search unavailable, falling back to LIKE: {e}")
+                fts = False
+        return fts
+
+    def _create_fts(self, kind, fields):
+        columns = ", ".join(fields)
+        new_values = ", ".join(f"new.{field}" for field in fields)
+        old_values = ", ".join(f"old.{field}" for field in fields)
+        self.db.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {kind}_fts USING fts5({columns}, content='{kind}', "
+            f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        # Keep the external-content index in step with the table
+        self.db.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {kind}_ai AFTER INSERT ON {kind} BEGIN "
+            f"INSERT INTO {kind}_fts (rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        self.db.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {kind}_ad AFTER DELETE ON {kind} BEGIN "
+            f"INSERT INTO {kind}_fts ({kind}_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        self.db.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {kind}_au AFTER UPDATE ON {kind} BEGIN "
+            f"INSERT INTO {kind}_fts ({kind}_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {kind}_fts (rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+
+    def version(self):
+        """Counter bumped by every import."""
+        with self.lock:
+            return self.db.execute("SELECT value FROM content_meta WHERE key = 'version'").fetchone()[0]
+
+    def categories(self, kind):
+        """Sorted distinct categories, cached until the next import."""
+        version = self.version()
+        cached = self.categories_cache.get(kind)
+        if cached and cached[0] == version:
+            return cached[1]
+        with self.lock:
+            rows = self.db.execute(f"SELECT DISTINCT category FROM {kind} ORDER BY category").fetchall()
+        categories = [row[0] for row in rows]
+        self.categories_cache[kind] = (version, categories)
+        return categories
+
+    def query(self, kind, category=None, search=None, page=1, per_page=20):
+        """
+        Return (records, total) for one page of kind, optionally limited to a
+        category and/or matching every word of search (as a prefix).
+        """
+        spec = self.KINDS[kind]
+        terms = re.findall(r'\w+', search or '')
+        conditions, params = [], []
+        if category:
+            conditions.append("k.category = ?")
+            params.append(category)
+
+        if terms and self.fts:
+            source = f"{kind}_fts f JOIN {kind} k ON k.id = f.rowid"
+            conditions.insert(0, f"{kind}_fts MATCH ?")
+            params.insert(0, " ".join(f'"{term}"*' for term in terms))
+            order = "f.rank"
+        else:
+            source = f"{kind} k"
+            for term in terms:
+                conditions.append("(" + " OR ".join(f"k.{field} LIKE ?" for field in spec['search']) + ")")
+                params.extend([f"%{term}%"] * len(spec['search']))
+            order = "k.id"
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        offset = (max(page, 1) - 1) * per_page
+        with self.lock:
+            total = self.db.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+            rows = self.db.execute(
+                f"SELECT k.* FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [per_page, offset]
+            ).fetchall()
+        return [self._record(kind, row) for row in rows], total
+
+    def iter_records(self, kind, batch_size=500):
+        """Yield every record of kind in insertion order."""
+        last_id = 0
+        while True:
+            with self.lock:
+                rows = self.db.execute(f"SELECT * FROM {kind} WHERE id > ? ORDER BY id LIMIT ?",
+                                       (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._record(kind, row)
+            last_id = rows[-1]['id']
+
+    def import_records(self, kind, records):
+        """
+        Insert or update records (dicts) of kind in one transaction.
+        Returns (imported, skipped); records missing a required field are skipped.
+        """
+        spec = self.KINDS[kind]
+        fields = spec['fields']
+        updates = ", ".join(f"{field} = excluded.{field}" for field in fields if field not in spec['unique'])
+        sql = (
+            f"INSERT INTO {kind} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))}) "
+            f"ON CONFLICT ({', '.join(spec['unique'])}) DO UPDATE SET {updates}"
+        )
+        imported = skipped = 0
+        with self.lock:
+            self.db.execute("BEGIN")
+            try:
+                for record in records:
+                    values = [str(record.get(field) or '').strip() for field in fields]
+                    if not all(value for field, value in zip(fields, values) if field in spec['required']):
+                        skipped += 1
+                        continue
+                    self.db.execute(sql, values)
+                    imported += 1
+                self.db.execute("UPDATE content_meta SET value = value + 1 WHERE key = 'version'")
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        return imported, skipped
+
+    def _record(self, kind, row):
+        return {field: row[field] for field in self.KINDS[kind]['fields']}
+
+content_store = ContentStore(CONTENT_DB_PATH, seed={
+    'flashcards': MALAY_ENGLISH_FLASHCARDS,
+    'stories': MALAY_CULTURAL_STORIES,
+})
+
+def load_content_records(path):
+    """Read records from a CSV file (header row) or a JSON list of objects."""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding='utf-8') as f:
+        records = json.load(f)
+    if not isinstance(records, list):
+        raise ValueError("JSON content must be a list of objects")
+    return records
+
+def phrase_table_entries():
+    """Flashcards in both directions, then any community glossaries (source_lang, source, target_lang, target)."""
+    for card in content_store.iter_records('flashcards'):
+        yield 'ms', card['malay'], 'en', card['english']
+        yield 'en', card['english'], 'ms', card['malay']
+    for path in PHRASE_GLOSSARY_PATHS:
+        for record in load_content_records(path):
+            yield record.get('source_lang'), record.get('source'), record.get('target_lang'), record.get('target')
+
+phrase_table.set_source(content_store.version, phrase_table_entries)
 
 # -------------------------
 # Flashcard Functions
 # -------------------------
-def get_flashcards_by_category(category=None):
-    """Get flashcards, optionally filtered by category"""
-    if category and category != 'all':
-        return [card for card in MALAY_ENGLISH_FLASHCARDS if card['category'] == category]
-    return MALAY_ENGLISH_FLASHCARDS
+def get_flashcards_by_category(category=None, search=None, page=1, per_page=FLASHCARDS_PER_PAGE):
+    """Get one page of flashcards, optionally filtered by category and search text. Returns (cards, total)."""
+    return content_store.query('flashcards', None if category == 'all' else category, search, page, per_page)
 
 def get_flashcard_categories():
     """Get unique categories from flashcards"""
-    categories = set(card['category'] for card in MALAY_ENGLISH_FLASHCARDS)
-    return sorted(categories)
+    return content_store.categories('flashcards')
 
 # -------------------------
 # Story Functions
 # -------------------------
-def get_stories_by_category(category=None):
-    """Get stories, optionally filtered by category"""
-    if category and category != 'all':
-        return [story for story in MALAY_CULTURAL_STORIES if story['category'] == category]
-    return MALAY_CULTURAL_STORIES
+def get_stories_by_category(category=None, search=None, page=1, per_page=STORIES_PER_PAGE):
+    """Get one page of stories, optionally filtered by category and search text. Returns (stories, total)."""
+    return content_store.query('stories', None if category == 'all' else category, search, page, per_page)
 
 def get_story_categories():
     """Get unique categories from stories"""
-    categories = set(story['category'] for story in MALAY_CULTURAL_STORIES)
-    return sorted(categories)
+    return content_store.categories('stories')
+
+# -------------------------
+# Page Cache
+# -------------------------
+class PageCache:
+    """
+    LRU of rendered HTML keyed by endpoint, query args and content store
+    version, so an import invalidates every page that could show its data.
+    Each entry keeps a strong ETag. Responses are sent with no-cache, so
+    clients and CDNs revalidate on every visit (a cheap 304) and never show a
+    stored page in place of one carrying a flash message or a new deploy.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.pages = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, view):
+        """Decorator for GET views whose output depends only on query args and content."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Pending flash messages are rendered into the page, so it can't be shared
+            if request.cookies.get(app.config['SESSION_COOKIE_NAME']) and flask_session.get('_flashes'):
+                response = Response(view(*args, **kwargs), mimetype='text/html')
+                response.cache_control.no_store = True
+                return response
+
+            key = (request.endpoint, tuple(sorted(request.args.items(multi=True))), content_store.version())
+            with self.lock:
+                entry = self.pages.get(key)
+                if entry:
+                    self.pages.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if not entry:
+                body = view(*args, **kwargs).encode('utf-8')
+                entry = (body, hashlib.sha256(body).hexdigest()[:32])
+                with self.lock:
+                    self.pages[key] = entry
+                    while len(self.pages) > self.max_entries:
+                        self.pages.popitem(last=False)
+
+            response = Response(entry[0], mimetype='text/html')
+            response.set_etag(entry[1])
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        return wrapper
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.pages), 'hits': self.hits, 'misses': self.misses}
+
+page_cache = PageCache(PAGE_CACHE_SIZE)
 
 # -------------------------
 # Flask Routes
 # -------------------------
 @app.route('/')
+@page_cache.cached
 def index():
     return render_template('index.html', languages=STANDARD_LANGUAGE_CODES)
 
 @app.route('/audio-translation')
+@page_cache.cached
 def audio_translation():
     return render_template('audio_translation.html', languages=STANDARD_LANGUAGE_CODES)
 
 @app.route('/document-translation')
+@page_cache.cached
 def document_translation():
     return render_template('document_translation.html', languages=STANDARD_LANGUAGE_CODES)
 
 @app.route('/video-translation')
+@page_cache.cached
 def video_translation():
     return render_template('video_translation.html', languages=STANDARD_LANGUAGE_CODES)
 
 @app.route('/flashcards')
+@page_cache.cached
 def flashcards():
     category = request.args.get('category', 'all')
-    flashcards = get_flashcards_by_category(category)
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    flashcards, total = get_flashcards_by_category(category, query, page)
     categories = get_flashcard_categories()
     
     return render_template('flashcards.html', 
                          flashcards=flashcards,
                          categories=categories,
-                         selected_category=category)
+                         selected_category=category,
+                         query=query,
+                         page=page,
+                         pages=max(1, math.ceil(total / FLASHCARDS_PER_PAGE)),
+                         total=total)
 
 @app.route('/cultural-stories')
+@page_cache.cached
 def cultural_stories():
     category = request.args.get('category', 'all')
-    stories = get_stories_by_category(category)
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    stories, total = get_stories_by_category(category, query, page)
     categories = get_story_categories()
     
     return render_template('cultural_stories.html', 
                          stories=stories,
                          categories=categories,
-                         selected_category=category)
+                         selected_category=category,
+                         query=query,
+                         page=page,
+                         pages=max(1, math.ceil(total / STORIES_PER_PAGE)),
+                         total=total)
 
 @app.route('/ancient-texts')
 def ancient_texts():
@@ -637,296 +3527,438 @@ def ai_tutor():
     flash('AI Tutor feature is coming soon!')
     return redirect(url_for('index'))
 
-@app.route('/translate-audio', methods=['POST'])
-def translate_audio():
-    # Check if file was uploaded or URL was provided
-    file = None
-    file_url = request.form.get('file_url', '').strip()
-    
-    if 'audio_file' in request.files:
-        file = request.files['audio_file']
-        if file.filename == '':
-            file = None
-    
-    if not file and not file_url:
-        flash('Please either upload a file or provide a URL')
-        return redirect(url_for('audio_translation'))
-    
-    # Get form data
-    source_lang = request.form.get('source_lang', 'auto')
-    target_lang = request.form.get('target_lang', 'en')
-    
-    # Generate unique ID for this session
+@timed('upload')
+def save_upload(file, session_id):
+    """Stream an upload to UPLOAD_FOLDER, keeping its extension. Returns (path, sha256)."""
+    filename = secure_filename(file.filename)
+    file_ext = file.filename.rsplit('.', 1)[1].lower()
+    if not filename.lower().endswith(f".{file_ext}"):
+        filename = f"{filename}.{file_ext}"
+    upload_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{filename}")
+
+    digest = hashlib.sha256()
+    with open(upload_path, 'wb') as out_file:
+        for chunk in iter(lambda: file.stream.read(URL_DOWNLOAD_CHUNK_BYTES), b''):
+            digest.update(chunk)
+            out_file.write(chunk)
+    return upload_path, digest.hexdigest()
+
+def submit_pipeline_job(file_type, pipeline, source_lang, target_lang, file=None, file_url='', text=None,
+                        options=None):
+    """
+    Save the upload (if any) and queue its pipeline under a new session id.
+
+    Returns the job snapshot, which belongs to an earlier job if identical
+    input is still being processed, or None if the queue is full.
+    """
+    options = options or {}
     session_id = uuid.uuid4().hex[:8]
-    
-    try:
-        # Handle file upload or URL download
+
+    # Keep the janitor away from this session's files until its pipeline finishes
+    file_janitor.protect(session_id)
+    upload_path = None
+    if text is not None:
+        args = (session_id, text, source_lang, target_lang)
+        input_key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    else:
+        content_hash = None
         if file:
-            if not allowed_file(file.filename, 'audio'):
-                flash('Invalid file type. Please upload MP3, WAV, M4A, or FLAC.')
-                return redirect(url_for('audio_translation'))
-            
-            upload_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{secure_filename(file.filename)}")
-            file.save(upload_path)
-        else:
-            # Download from URL
-            upload_path, filename = download_file_from_url(file_url, 'audio')
-        
-        # Step 1: Transcribe audio
-        transcribed_text = transcribe_audio(upload_path, source_lang)
-        
-        # Step 2: Detect language if auto
-        if source_lang == "auto":
-            detected_lang, lang_name, confidence = detect_language(transcribed_text)
-            source_lang = detected_lang
-        else:
-            detected_lang = source_lang
-            lang_name = LANGUAGE_CODE_TO_NAME.get(source_lang, "unknown")
-            confidence = 1.0
-        
-        # Step 3: Translate if needed
-        if source_lang == target_lang:
-            translated_text = transcribed_text
-        else:
-            translated_text = translate_text(transcribed_text, source_lang, target_lang)
-        
-        # Step 4: Convert to speech
-        output_audio = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_output.mp3")
-        text_to_speech(translated_text, target_lang, output_audio)
-        
-        # Step 5: Save text files
-        transcript_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_transcript.txt")
-        translation_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_translation.txt")
-        
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write(transcribed_text)
-        
-        with open(translation_file, 'w', encoding='utf-8') as f:
-            f.write(translated_text)
-        
-        # Prepare results
-        results = {
-            'session_id': session_id,
-            'source_lang': lang_name,
-            'target_lang': LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"),
-            'confidence': f"{confidence:.1%}",
-            'transcribed_text': transcribed_text,
-            'translated_text': translated_text,
-            'has_translation': source_lang != target_lang,
-            'file_type': 'audio'
-        }
-        
-        return render_template('results.html', **results)
-        
-    except Exception as e:
-        flash(f'Error processing audio: {str(e)}')
-        return redirect(url_for('audio_translation'))
+            upload_path, content_hash = save_upload(file, session_id)
+        args = (session_id, upload_path, file_url, source_lang, target_lang, content_hash)
+        input_key = content_hash or file_url
 
-@app.route('/translate-document', methods=['POST'])
-def translate_document():
+    # Resubmitting the same input while it is still being processed joins the existing job
+    dedupe_key = (file_type, input_key, source_lang, target_lang, tuple(sorted(options.items())))
+    job = job_queue.submit(session_id, file_type, pipeline, *args, dedupe_key=dedupe_key, **options)
+    if job is None or job['job_id'] != session_id:
+        file_janitor.unprotect(session_id)
+        file_janitor.discard(upload_path)
+    return job
+
+def enqueue_pipeline(file_type, file_field, form_endpoint, pipeline, invalid_message):
+    """Validate a pipeline form post, queue the job and redirect to its status page."""
     # Check if file was uploaded or URL was provided
     file = None
     file_url = request.form.get('file_url', '').strip()
-    
-    if 'document_file' in request.files:
-        file = request.files['document_file']
+
+    if file_field in request.files:
+        file = request.files[file_field]
         if file.filename == '':
             file = None
-    
+
     if not file and not file_url:
         flash('Please either upload a file or provide a URL')
-        return redirect(url_for('document_translation'))
-    
+        return redirect(url_for(form_endpoint))
+
     # Get form data
     source_lang = request.form.get('source_lang', 'auto')
     target_lang = request.form.get('target_lang', 'en')
-    
-    # Generate unique ID for this session
-    session_id = uuid.uuid4().hex[:8]
-    
-    try:
-        # Handle file upload or URL download
-        if file:
-            if not allowed_file(file.filename, 'document'):
-                flash('Invalid file type. Please upload PDF, DOCX, or TXT.')
-                return redirect(url_for('document_translation'))
-            
-            upload_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{secure_filename(file.filename)}")
-            file.save(upload_path)
-            
-            # Get file extension from uploaded file
-            file_ext = file.filename.rsplit('.', 1)[1].lower()
-        else:
-            # Download from URL
-            upload_path, filename = download_file_from_url(file_url, 'document')
-            file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else 'txt'
-        
-        # Extract text based on file type
-        if file_ext == 'pdf':
-            extracted_text = extract_text_from_pdf(upload_path)
-        elif file_ext == 'docx':
-            extracted_text = extract_text_from_docx(upload_path)
-        elif file_ext == 'txt':
-            with open(upload_path, 'r', encoding='utf-8') as f:
-                extracted_text = f.read()
-        else:
-            flash('Unsupported document format')
-            return redirect(url_for('document_translation'))
-        
-        # Detect language if auto
-        if source_lang == "auto":
-            detected_lang, lang_name, confidence = detect_language(extracted_text)
-            source_lang = detected_lang
-        else:
-            detected_lang = source_lang
-            lang_name = LANGUAGE_CODE_TO_NAME.get(source_lang, "unknown")
-            confidence = 1.0
-        
-        # Translate if needed
-        if source_lang == target_lang:
-            translated_text = extracted_text
-        else:
-            translated_text = translate_text(extracted_text, source_lang, target_lang)
-        
-        # Save files
-        original_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_original.txt")
-        translation_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_translation.txt")
-        
-        with open(original_file, 'w', encoding='utf-8') as f:
-            f.write(extracted_text)
-        
-        with open(translation_file, 'w', encoding='utf-8') as f:
-            f.write(translated_text)
-        
-        # Prepare results
-        results = {
-            'session_id': session_id,
-            'source_lang': lang_name,
-            'target_lang': LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"),
-            'confidence': f"{confidence:.1%}",
-            'transcribed_text': extracted_text,
-            'translated_text': translated_text,
-            'has_translation': source_lang != target_lang,
-            'file_type': 'document'
-        }
-        
-        return render_template('results.html', **results)
-        
-    except Exception as e:
-        flash(f'Error processing document: {str(e)}')
-        return redirect(url_for('document_translation'))
+
+    if file and not allowed_file(file.filename, file_type):
+        flash(invalid_message)
+        return redirect(url_for(form_endpoint))
+
+    options = {}
+    if file_type in ('audio', 'video') and request.form.get('segmented'):
+        options['segmented'] = True
+
+    job = submit_pipeline_job(file_type, pipeline, source_lang, target_lang, file=file, file_url=file_url,
+                              options=options)
+    if job is None:
+        flash('The server is busy processing other files. Please try again in a few minutes.')
+        return redirect(url_for(form_endpoint))
+
+    return redirect(url_for('job_status', job_id=job['job_id']))
+
+@app.route('/translate-audio', methods=['POST'])
+def translate_audio():
+    return enqueue_pipeline('audio', 'audio_file', 'audio_translation', run_audio_pipeline,
+                            'Invalid file type. Please upload MP3, WAV, M4A, or FLAC.')
+
+@app.route('/translate-document', methods=['POST'])
+def translate_document():
+    return enqueue_pipeline('document', 'document_file', 'document_translation', run_document_pipeline,
+                            'Invalid file type. Please upload PDF, DOCX, or TXT.')
 
 @app.route('/translate-video', methods=['POST'])
 def translate_video():
-    # Check if file was uploaded or URL was provided
-    file = None
-    file_url = request.form.get('file_url', '').strip()
-    
-    if 'video_file' in request.files:
-        file = request.files['video_file']
-        if file.filename == '':
-            file = None
-    
-    if not file and not file_url:
-        flash('Please either upload a file or provide a URL')
-        return redirect(url_for('video_translation'))
-    
-    # Get form data
-    source_lang = request.form.get('source_lang', 'auto')
-    target_lang = request.form.get('target_lang', 'en')
-    
-    # Generate unique ID for this session
-    session_id = uuid.uuid4().hex[:8]
-    
+    return enqueue_pipeline('video', 'video_file', 'video_translation', run_video_pipeline,
+                            'Invalid file type. Please upload MP4, MOV, AVI, or MKV.')
+
+FORM_ENDPOINTS = {
+    'audio': 'audio_translation',
+    'document': 'document_translation',
+    'video': 'video_translation',
+}
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        flash('Job not found')
+        return redirect(url_for('index'))
+    add_job_server_timing(job)
+
+    if job['status'] == 'completed':
+        return render_template('results.html', **job['results'])
+    if job['status'] == 'failed':
+        flash(f"Error processing {job['file_type']}: {job['error']}")
+        return redirect(url_for(FORM_ENDPOINTS.get(job['file_type'], 'index')))
+
+    # Render the results page empty and let it fill in from the progress stream
+    return render_template('results.html', live=True, job_id=job_id, session_id=job_id,
+                           file_type=job['file_type'], source_lang='', target_lang='', confidence='',
+                           transcribed_text='', translated_text='', has_translation=True)
+
+@app.route('/events/<session_id>')
+def progress_events(session_id):
+    """Server-sent events with a job's progress and partial results."""
+    if not progress_broker.exists(session_id):
+        return jsonify({'error': 'Job not found'}), 404
+
     try:
-        # Handle file upload or URL download
-        if file:
-            if not allowed_file(file.filename, 'video'):
-                flash('Invalid file type. Please upload MP4, MOV, AVI, or MKV.')
-                return redirect(url_for('video_translation'))
-            
-            upload_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{secure_filename(file.filename)}")
-            file.save(upload_path)
-        else:
-            # Download from URL
-            upload_path, filename = download_file_from_url(file_url, 'video')
-        
-        # Step 1: Extract audio from video
-        audio_path = extract_audio_from_video(upload_path)
-        
-        # Step 2: Transcribe audio
-        transcribed_text = transcribe_audio(audio_path, source_lang)
-        
-        # Step 3: Detect language if auto
-        if source_lang == "auto":
-            detected_lang, lang_name, confidence = detect_language(transcribed_text)
-            source_lang = detected_lang
-        else:
-            detected_lang = source_lang
-            lang_name = LANGUAGE_CODE_TO_NAME.get(source_lang, "unknown")
-            confidence = 1.0
-        
-        # Step 4: Translate if needed
-        if source_lang == target_lang:
-            translated_text = transcribed_text
-        else:
-            translated_text = translate_text(transcribed_text, source_lang, target_lang)
-        
-        # Step 5: Convert to speech
-        output_audio = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_output.mp3")
-        text_to_speech(translated_text, target_lang, output_audio)
-        
-        # Step 6: Save text files
-        transcript_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_transcript.txt")
-        translation_file = os.path.join(app.config['OUTPUT_FOLDER'], f"{session_id}_translation.txt")
-        
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write(transcribed_text)
-        
-        with open(translation_file, 'w', encoding='utf-8') as f:
-            f.write(translated_text)
-        
-        # Prepare results
-        results = {
-            'session_id': session_id,
-            'source_lang': lang_name,
-            'target_lang': LANGUAGE_CODE_TO_NAME.get(target_lang, "unknown"),
-            'confidence': f"{confidence:.1%}",
-            'transcribed_text': transcribed_text,
-            'translated_text': translated_text,
-            'has_translation': source_lang != target_lang,
-            'file_type': 'video'
-        }
-        
-        return render_template('results.html', **results)
-        
-    except Exception as e:
-        flash(f'Error processing video: {str(e)}')
-        return redirect(url_for('video_translation'))
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+
+    def stream():
+        yield "retry: 3000\n\n"
+        for item in progress_broker.subscribe(session_id, last_event_id):
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, event, data = item
+            yield f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/jobs/<job_id>/status')
+def job_status_json(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    add_job_server_timing(job)
+
+    return jsonify({
+        'job_id': job['job_id'],
+        'file_type': job['file_type'],
+        'status': job['status'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'timings': job['timings'],
+        'result_url': url_for('job_result', job_id=job_id),
+    })
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    add_job_server_timing(job)
+    if job['status'] == 'failed':
+        return jsonify({'status': 'failed', 'error': job['error']}), 500
+    if job['status'] != 'completed':
+        return jsonify({'status': job['status']}), 202
+
+    return jsonify({'status': 'completed', 'results': job['results']})
+
+# -------------------------
+# Batch API
+# -------------------------
+API_PIPELINES = {
+    'audio': run_audio_pipeline,
+    'document': run_document_pipeline,
+    'video': run_video_pipeline,
+    'text': run_text_pipeline,
+}
+
+def api_error(code, message, status):
+    return jsonify({'error': {'code': code, 'message': message}}), status
+
+def parse_batch_items(kind):
+    """
+    Read batch items from a JSON body or a multipart form. Returns
+    (items, error) where each item is a dict with one of file/url/text plus
+    source_lang, target_lang and options.
+
+    JSON: {"source_lang", "target_lang", "segmented", "items": [{"url"|"text", ...overrides}]}
+    Form: repeated "files" uploads, "url" or "text" fields, plus the shared fields.
+    """
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not isinstance(body.get('items'), list):
+            return None, 'Expected a JSON object with an "items" list'
+        defaults = body
+        entries = []
+        for entry in body['items']:
+            if isinstance(entry, str):
+                entry = {'text' if kind == 'text' else 'url': entry}
+            entries.append(entry if isinstance(entry, dict) else {})
+    else:
+        defaults = request.form
+        entries = ([{'file': file} for file in request.files.getlist('files')] +
+                   [{'url': url} for url in request.form.getlist('url')] +
+                   [{'text': text} for text in request.form.getlist('text')])
+
+    items = []
+    for entry in entries:
+        segmented = str(entry.get('segmented', defaults.get('segmented')) or '').lower() in ('1', 'true', 'on')
+        items.append({
+            'file': entry.get('file'),
+            'url': str(entry.get('url') or '').strip(),
+            'text': entry.get('text') if kind == 'text' else None,
+            'source_lang': str(entry.get('source_lang') or defaults.get('source_lang') or 'auto'),
+            'target_lang': str(entry.get('target_lang') or defaults.get('target_lang') or 'en'),
+            'options': {'segmented': True} if segmented and kind in ('audio', 'video') else {},
+        })
+    return items, None
+
+def validate_batch_item(kind, item):
+    """Return (code, message) for an item that can't be queued, else None."""
+    if item['source_lang'] != 'auto' and item['source_lang'] not in LANGUAGE_CODE_TO_NAME:
+        return 'unsupported_language', f"Unsupported source language: {item['source_lang']}"
+    if item['target_lang'] not in LANGUAGE_CODE_TO_NAME:
+        return 'unsupported_language', f"Unsupported target language: {item['target_lang']}"
+    if kind == 'text':
+        if not isinstance(item['text'], str) or not item['text'].strip():
+            return 'invalid_item', 'Text items need non-empty "text"'
+        if len(item['text']) > API_MAX_TEXT_CHARS:
+            return 'too_large', f"Text items are limited to {API_MAX_TEXT_CHARS} characters"
+        return None
+    if item['file'] is not None:
+        if not isinstance(item['file'], FileStorage):
+            return 'invalid_item', 'Files must be uploaded as multipart "files" fields'
+        if not allowed_file(item['file'].filename, kind):
+            return 'invalid_file_type', f"Unsupported {kind} file: {item['file'].filename}"
+        return None
+    if urlparse(item['url']).scheme not in ('http', 'https'):
+        return 'invalid_item', f"{kind.title()} items need an uploaded file or an http(s) URL"
+    return None
+
+def batch_result_line(index, job):
+    """NDJSON record for a finished batch item."""
+    if job is None:
+        return {'type': 'error', 'index': index,
+                'error': {'code': 'expired', 'message': 'Job expired before its result was read'}}
+    if job['status'] == 'failed':
+        return {'type': 'error', 'index': index, 'job_id': job['job_id'],
+                'error': {'code': 'pipeline_failed', 'message': job['error']}}
+    downloads = {name: url_for('download_file', file_type=name, session_id=job['job_id'], _external=True)
+                 for name in ARTIFACTS if artifact_path(name, job['job_id'])}
+    return {'type': 'result', 'index': index, 'job_id': job['job_id'],
+            'results': job['results'], 'downloads': downloads}
+
+@app.route('/api/v1/translate/<kind>', methods=['POST'])
+def api_translate(kind):
+    """
+    Queue a batch of items for one pipeline and stream NDJSON back: a batch
+    record, one queued/error record per item, one result/error record per
+    item as it finishes (in completion order), heartbeats while waiting and a
+    final summary.
+    """
+    if kind not in API_PIPELINES:
+        return api_error('not_found', f"Unknown pipeline: {kind}", 404)
+
+    items, error = parse_batch_items(kind)
+    if error:
+        return api_error('invalid_request', error, 400)
+    if not items:
+        return api_error('invalid_request', 'The batch has no items', 400)
+    if len(items) > API_MAX_BATCH_ITEMS:
+        return api_error('too_many_items', f"A batch may hold at most {API_MAX_BATCH_ITEMS} items", 413)
+
+    # Uploads are saved and every item queued before streaming starts
+    records = []
+    pending = {}   # job_id -> indexes of the items it serves
+    for index, item in enumerate(items):
+        invalid = validate_batch_item(kind, item)
+        job = None
+        if not invalid:
+            job = submit_pipeline_job(kind, API_PIPELINES[kind], item['source_lang'], item['target_lang'],
+                                      file=item['file'], file_url=item['url'], text=item['text'],
+                                      options=item['options'])
+            if job is None:
+                invalid = 'queue_full', 'The server is busy; retry this item later'
+        if invalid:
+            records.append({'type': 'error', 'index': index,
+                            'error': {'code': invalid[0], 'message': invalid[1]}})
+            continue
+        pending.setdefault(job['job_id'], []).append(index)
+        records.append({'type': 'queued', 'index': index, 'job_id': job['job_id'],
+                        'status_url': url_for('job_status_json', job_id=job['job_id'], _external=True),
+                        'events_url': url_for('progress_events', session_id=job['job_id'], _external=True)})
+
+    def stream():
+        completed = failed = 0
+        yield json.dumps({'type': 'batch', 'kind': kind, 'items': len(items)}) + "\n"
+        for record in records:
+            if record['type'] == 'error':
+                failed += 1
+            yield json.dumps(record) + "\n"
+
+        while pending:
+            finished = job_queue.wait_any(list(pending), PROGRESS_HEARTBEAT)
+            if not finished:
+                yield json.dumps({'type': 'heartbeat'}) + "\n"
+                continue
+            for job_id, job in finished.items():
+                for index in pending.pop(job_id):
+                    record = batch_result_line(index, job)
+                    if record['type'] == 'result':
+                        completed += 1
+                    else:
+                        failed += 1
+                    yield json.dumps(record) + "\n"
+
+        yield json.dumps({'type': 'done', 'completed': completed, 'failed': failed}) + "\n"
+
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# -------------------------
+# Metrics Endpoint
+# -------------------------
+metrics.register_gauges('translation_cache', translation_cache.stats)
+metrics.register_gauges('translation_provider',
+                        lambda: {name: {field: value for field, value in breaker.snapshot().items() if field != 'last_error'}
+                                 for name, breaker in translation_service.breakers.items()},
+                        label='provider')
+metrics.register_gauges('phrase_table', phrase_table.stats)
+metrics.register_gauges('speech_cache', speech_cache.stats)
+metrics.register_gauges('page_cache', page_cache.stats)
+metrics.register_gauges('storage', file_janitor.stats)
+metrics.register_gauges('jobs', job_queue.stats)
+
+@app.before_request
+def start_request_timing():
+    timing_sink.stages = []
+    timing_sink.started = time.perf_counter()
+
+@app.after_request
+def add_server_timing(response):
+    """Report this request's stages (and a finished job's, where relevant) in Server-Timing."""
+    stages = getattr(timing_sink, 'stages', None)
+    if stages is None:
+        return response
+    total = time.perf_counter() - timing_sink.started
+    timing_sink.stages = None
+    metrics.observe('languard_request_duration_seconds', total, 'Time to produce each response (before streaming)',
+                    endpoint=request.endpoint or 'unmatched')
+    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in summarize_stages(stages).items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    response.headers['Server-Timing'] = ", ".join(entries)
+    return response
+
+def add_job_server_timing(job):
+    """Include a job's recorded stage timings in this response's Server-Timing header."""
+    stages = getattr(timing_sink, 'stages', None)
+    if stages is not None and job.get('timings'):
+        stages.extend((f"job_{stage}", seconds) for stage, seconds in job['timings'].items())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8',
+                    headers={'Cache-Control': 'no-store'})
+
+@app.route('/ops/translation')
+def translation_routing_status():
+    return jsonify(translation_service.routing_status())
+
+@app.route('/ops/pages')
+def page_cache_status():
+    return jsonify(page_cache.stats())
+
+@app.route('/ops/storage')
+def storage_status():
+    return jsonify(file_janitor.stats())
 
 @app.route('/download/<file_type>/<session_id>')
 def download_file(file_type, session_id):
-    if file_type == 'transcript':
-        filename = f"{session_id}_transcript.txt"
-        display_name = "transcript.txt"
-    elif file_type == 'translation':
-        filename = f"{session_id}_translation.txt"
-        display_name = "translation.txt"
-    elif file_type == 'audio':
-        filename = f"{session_id}_output.mp3"
-        display_name = "translated_audio.mp3"
-    else:
+    if file_type not in ARTIFACTS:
         flash('Invalid file type')
         return redirect(url_for('index'))
-    
-    file_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
-    
-    if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True, download_name=display_name)
-    else:
+    filenames, display_name, mimetype = ARTIFACTS[file_type]
+
+    # Published artifacts are fetched straight from S3, which handles ranges and caching
+    if ARTIFACT_STORAGE == 's3':
+        presigned_url = artifact_presigned_url(file_type, session_id)
+        if presigned_url:
+            response = redirect(presigned_url)
+            response.cache_control.no_store = True
+            return response
+
+    file_path = artifact_path(file_type, session_id)
+    if file_path is None:
         flash('File not found')
         return redirect(url_for('index'))
 
+    is_text = mimetype.startswith('text/')
+    compress = (is_text and 'Range' not in request.headers and request.accept_encodings['gzip']
+                and os.path.getsize(file_path) >= ARTIFACT_GZIP_MIN_BYTES)
+    if compress:
+        file_path = gzip_artifact(file_path)
+
+    # conditional=True answers If-None-Match/If-Modified-Since with 304 and Range with 206
+    response = send_file(file_path, mimetype=mimetype, as_attachment=True, download_name=display_name,
+                         conditional=True, etag=True, max_age=ARTIFACT_MAX_AGE)
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    if is_text:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+@app.cli.command('import-content')
+@click.argument('kind', type=click.Choice(sorted(ContentStore.KINDS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_content_command(kind, path):
+    """Bulk import flashcards or stories from a CSV or JSON file."""
+    imported, skipped = content_store.import_records(kind, load_content_records(path))
+    click.echo(f"Imported {imported} {kind}, skipped {skipped} without required fields.")
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
 
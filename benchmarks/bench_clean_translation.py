@@ -0,0 +1,104 @@
+"""
+Throughput of the translation post-processor against the previous
+multi-pass implementation.
+
+    python benchmarks/bench_clean_translation.py [--mb 8] [--repeat 3]
+
+Both implementations run on the same synthetic corpus. The script checks that
+their output is identical, then reports MB/s for each.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import clean_translation  # noqa: E402
+
+
+def legacy_clean_translation(text, terminate=True):
+    """The implementation clean_translation replaced, kept for comparison."""
+    text = re.sub(r'(\w)\.(\w)', r'\1\2', text)
+    fixes = [
+        (r'\bMiz\b', 'We'),
+        (r'Senses Social Science', 'Social Sciences'),
+        (r'\bwe has\b', 'we have'),
+        (r'\bi\b', 'I'),
+        (r'\bscis\b', 'SCIS'),
+        (r'\bsuss\b', 'SUSS'),
+        (r'\.\.', '.'),
+        (r' +', ' '),
+    ]
+    for pattern, replacement in fixes:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    text = re.sub(r'([a-z])([A-Z])', r'\1. \2', text)
+    sentences = text.split('. ')
+    cleaned_sentences = []
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if sentence:
+            sentence = sentence[0].upper() + sentence[1:]
+            cleaned_sentences.append(sentence)
+    text = '. '.join(cleaned_sentences)
+    if terminate and not text.endswith('.'):
+        text += '.'
+    return text
+
+
+SAMPLE_SENTENCES = [
+    "Miz went to the market early in the morning",
+    "the students of scis and suss met at the library",
+    "we has many stories about the river and the forest..",
+    "i think the Senses Social Science faculty is  growing",
+    "the old man told the children a story about the mouse deer",
+    "the village celebrated the harvest with music and dance",
+    "she said that i should visit the museum.It opened last year",
+    "the translation of e.g. idioms remains difficult",
+]
+
+
+def build_corpus(megabytes, seed=0):
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    parts, size = [], 0
+    while size < target:
+        sentence = rng.choice(SAMPLE_SENTENCES)
+        separator = rng.choice([". ", ". ", " ", "\n", ". \n"])
+        parts.append(sentence + separator)
+        size += len(sentence) + len(separator)
+    return "".join(parts)
+
+
+def measure(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=float, default=8, help="corpus size in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    text = build_corpus(args.mb)
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+
+    if clean_translation(text) != legacy_clean_translation(text):
+        sys.exit("output differs from the legacy implementation")
+
+    legacy = measure(legacy_clean_translation, text, args.repeat)
+    current = measure(clean_translation, text, args.repeat)
+    print(f"corpus:   {size_mb:.1f} MB")
+    print(f"legacy:   {size_mb / legacy:8.1f} MB/s")
+    print(f"compiled: {size_mb / current:8.1f} MB/s  ({legacy / current:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
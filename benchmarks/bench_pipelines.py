@@ -0,0 +1,624 @@
+"""
+End-to-end throughput and latency of the audio, document and video pipelines
+against local stand-ins for AWS and Google.
+
+    python benchmarks/bench_pipelines.py [--routes audio,document,video] [--requests 20]
+        [--concurrency 4] [--source upload|url] [--latency polly=0.2] [--failure-rate google=0.1]
+        [--save] [--compare <sha or results file>]
+
+The app runs in a scratch directory. Its S3, Transcribe, Polly, Comprehend,
+Textract and Translate clients are replaced with in-memory fakes that have
+configurable latency (with +/-25% jitter) and failure rates. Requests for
+translate.googleapis.com and the URL origin go to a requests adapter mounted
+on the app's HTTP session. Each route is driven through the Flask test client
+at the given concurrency: the form is posted, then the job's status is polled
+until it finishes.
+
+The report lists throughput, p50/p95/p99 latency, peak RSS and the per-stage
+breakdown of each route. With --save it is written to
+benchmarks/results/<git sha>.json so runs from different commits can be
+compared with --compare. Video inputs are
+generated with ffmpeg, and the video route is skipped when ffmpeg is missing.
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from botocore.exceptions import ClientError
+from requests.adapters import BaseAdapter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+ROUTES = {
+    # route: (form endpoint, file field, input extension)
+    "audio": ("/translate-audio", "audio_file", "wav"),
+    "document": ("/translate-document", "document_file", "docx"),
+    "video": ("/translate-video", "video_file", "mp4"),
+}
+
+# Seconds per call (Transcribe: per job) and failure probability of each fake service.
+# Transcribe defaults to the app's TRANSCRIBE_SPEED_RATIO x --media-seconds, the
+# processing time its poller schedules the first check for.
+DEFAULT_LATENCY = {
+    "s3": 0.05, "transcribe": None, "transcribe_queue": 0.2, "polly": 0.1, "comprehend": 0.05,
+    "textract": 0.2, "translate": 0.08, "google": 0.08, "origin": 0.02,
+}
+DEFAULT_FAILURE_RATE = {service: 0.0 for service in DEFAULT_LATENCY}
+
+SENTENCES = [
+    "The village celebrated the harvest with music and dance",
+    "Our students met at the library to prepare for the examination",
+    "The old fisherman told the children a story about the mouse deer",
+    "Heavy rain is expected across the peninsula this afternoon",
+    "Please remember to bring your identity card to the appointment",
+    "The market opens early and closes before the evening prayers",
+    "She explained the new timetable to everyone in the department",
+    "The committee will announce the results of the competition next week",
+]
+
+
+# -------------------------
+# Fakes
+# -------------------------
+class FakeService:
+    """Latency and failure injection shared by the fake clients."""
+
+    def __init__(self, name, latency, failure_rate, rng):
+        self.name = name
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = rng
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def call(self, operation, latency=None, may_fail=True):
+        with self.lock:
+            self.calls += 1
+            delay = (self.latency if latency is None else latency) * self.rng.uniform(0.75, 1.25)
+            failed = may_fail and self.rng.random() < self.failure_rate
+        time.sleep(delay)
+        if failed:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "injected failure"}}, operation)
+
+
+class FakeS3(FakeService):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.objects = {}
+
+    def upload_file(self, path, bucket, key, **kwargs):
+        self.call("PutObject")
+        with open(path, "rb") as f:
+            self.objects[(bucket, key)] = f.read()
+
+    def put(self, bucket, key, body):
+        self.objects[(bucket, key)] = body
+
+    def head_object(self, Bucket, Key):
+        self.call("HeadObject")
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def get_object(self, Bucket, Key):
+        self.call("GetObject")
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def generate_presigned_url(self, operation, Params=None, ExpiresIn=3600):
+        return f"https://bench-bucket.invalid/{Params['Key']}?expires={ExpiresIn}"
+
+
+class FakeTranscribe(FakeService):
+    """Jobs finish transcribe_queue + transcribe seconds after they start."""
+
+    class exceptions:
+        class ConflictException(ClientError):
+            pass
+
+        class BadRequestException(ClientError):
+            pass
+
+    def __init__(self, name, latency, failure_rate, rng, queue_latency, s3):
+        super().__init__(name, latency, failure_rate, rng)
+        self.queue_latency = queue_latency
+        self.s3 = s3
+        self.jobs = {}
+
+    def start_transcription_job(self, **params):
+        # Injected failures show up as FAILED jobs rather than API errors
+        self.call("StartTranscriptionJob", latency=0.05, may_fail=False)
+        name = params["TranscriptionJobName"]
+        now = datetime.datetime.now(datetime.timezone.utc)
+        with self.lock:
+            if name in self.jobs:
+                raise self.exceptions.ConflictException(
+                    {"Error": {"Code": "ConflictException", "Message": "exists"}}, "StartTranscriptionJob")
+            queued = self.queue_latency * self.rng.uniform(0.75, 1.25)
+            processing = self.latency * self.rng.uniform(0.75, 1.25)
+            self.jobs[name] = {
+                "TranscriptionJobName": name,
+                "TranscriptionJobStatus": "IN_PROGRESS",
+                "CreationTime": now,
+                "StartTime": now + datetime.timedelta(seconds=queued),
+                "CompletionTime": now + datetime.timedelta(seconds=queued + processing),
+                "failed": self.rng.random() < self.failure_rate,
+                "media": params["Media"]["MediaFileUri"],
+                "bucket": params["OutputBucketName"],
+            }
+
+    def get_transcription_job(self, TranscriptionJobName):
+        self.call("GetTranscriptionJob", latency=0, may_fail=False)
+        self._advance()
+        job = self.jobs.get(TranscriptionJobName)
+        if job is None:
+            raise self.exceptions.BadRequestException(
+                {"Error": {"Code": "BadRequestException", "Message": "unknown job"}}, "GetTranscriptionJob")
+        return {"TranscriptionJob": self._summary(job)}
+
+    def delete_transcription_job(self, TranscriptionJobName):
+        self.call("DeleteTranscriptionJob", latency=0, may_fail=False)
+        with self.lock:
+            if self.jobs.pop(TranscriptionJobName, None) is None:
+                raise self.exceptions.BadRequestException(
+                    {"Error": {"Code": "BadRequestException", "Message": "unknown job"}}, "DeleteTranscriptionJob")
+
+    def list_transcription_jobs(self, Status=None, JobNameContains="", MaxResults=100, NextToken=None):
+        self.call("ListTranscriptionJobs", latency=0.01, may_fail=False)
+        self._advance()
+        with self.lock:
+            # Newest first, as the real API lists them
+            matches = [self._summary(job) for job in reversed(list(self.jobs.values()))
+                       if (Status is None or job["TranscriptionJobStatus"] == Status)
+                       and JobNameContains in job["TranscriptionJobName"]]
+        start = int(NextToken or 0)
+        page = matches[start:start + MaxResults]
+        response = {"TranscriptionJobSummaries": page}
+        if start + MaxResults < len(matches):
+            response["NextToken"] = str(start + MaxResults)
+        return response
+
+    def _advance(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        with self.lock:
+            due = [job for job in self.jobs.values()
+                   if job["TranscriptionJobStatus"] == "IN_PROGRESS" and job["CompletionTime"] <= now]
+            for job in due:
+                job["TranscriptionJobStatus"] = "FAILED" if job["failed"] else "COMPLETED"
+        for job in due:
+            if not job["failed"]:
+                self.s3.put(job["bucket"], f"{job['TranscriptionJobName']}.json", self._transcript(job))
+
+    def _transcript(self, job):
+        # About one sentence per 16KB of media, drawn deterministically from the media key
+        bucket, key = job["media"][len("s3://"):].split("/", 1)
+        size = len(self.s3.objects.get((bucket, key), b""))
+        rng = random.Random(key)
+        text = ". ".join(rng.choice(SENTENCES) for _ in range(max(1, min(200, size // 16384)))) + "."
+        return json.dumps({"results": {"transcripts": [{"transcript": text}]}}).encode("utf-8")
+
+    @staticmethod
+    def _summary(job):
+        summary = {key: value for key, value in job.items() if key[0].isupper()}
+        if job["TranscriptionJobStatus"] == "FAILED":
+            summary["FailureReason"] = "injected failure"
+        return summary
+
+
+class FakePolly(FakeService):
+    def synthesize_speech(self, Text, OutputFormat="mp3", VoiceId=None, **kwargs):
+        self.call("SynthesizeSpeech")
+        return {"AudioStream": io.BytesIO(b"\xff\xfb\x90\x00" + bytes(len(Text) * 40))}
+
+
+class FakeComprehend(FakeService):
+    def detect_dominant_language(self, Text):
+        self.call("DetectDominantLanguage")
+        return {"Languages": [{"LanguageCode": "en", "Score": 0.97}]}
+
+
+class FakeTextract(FakeService):
+    def detect_document_text(self, Document):
+        self.call("DetectDocumentText")
+        lines = random.Random(len(Document["Bytes"])).sample(SENTENCES, 4)
+        return {"Blocks": [{"BlockType": "LINE", "Text": line} for line in lines]}
+
+
+class FakeTranslate(FakeService):
+    def translate_text(self, Text, SourceLanguageCode, TargetLanguageCode, **kwargs):
+        self.call("TranslateText")
+        return {"TranslatedText": f"[{TargetLanguageCode}] {Text}"}
+
+
+class FakeHTTPAdapter(BaseAdapter):
+    """
+    Serves translate.googleapis.com and the benchmark's URL origin. Origin
+    files support HEAD and byte ranges like a static file server.
+    """
+
+    def __init__(self, google, origin, files):
+        super().__init__()
+        self.google = google
+        self.origin = origin
+        self.files = files
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        url = urlparse(request.url)
+        try:
+            if url.hostname == "translate.googleapis.com":
+                self.google.call("Translate")
+                params = parse_qs(url.query)
+                translated = f"[{params['tl'][0]}] {params['q'][0]}"
+                return self._response(request, 200, json.dumps([[[translated, params["q"][0], None, None]]]).encode())
+            self.origin.call("GET")
+        except ClientError:
+            return self._response(request, 503, b"injected failure")
+
+        body = self.files.get(url.path)
+        if body is None:
+            return self._response(request, 404, b"")
+        headers = {"Accept-Ranges": "bytes", "Content-Length": str(len(body))}
+        if request.method == "HEAD":
+            return self._response(request, 200, b"", headers)
+        match = re.match(r"bytes=(\d+)-(\d+)", request.headers.get("Range", ""))
+        if match:
+            start, end = int(match.group(1)), min(int(match.group(2)), len(body) - 1)
+            headers.update({"Content-Range": f"bytes {start}-{end}/{len(body)}", "Content-Length": str(end - start + 1)})
+            return self._response(request, 206, body[start:end + 1], headers)
+        return self._response(request, 200, body, headers)
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _response(request, status, body, headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers or {"Content-Length": str(len(body))})
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+
+def install_fakes(app_module, latency, failure_rate, seed):
+    rng = random.Random(seed)
+    fakes = {name: FakeService(name, latency[name], failure_rate[name], rng)
+             for name in ("google", "origin")}
+    s3 = FakeS3("s3", latency["s3"], failure_rate["s3"], rng)
+    fakes.update({
+        "s3": s3,
+        "transcribe": FakeTranscribe("transcribe", latency["transcribe"], failure_rate["transcribe"], rng,
+                                     latency["transcribe_queue"], s3),
+        "polly": FakePolly("polly", latency["polly"], failure_rate["polly"], rng),
+        "comprehend": FakeComprehend("comprehend", latency["comprehend"], failure_rate["comprehend"], rng),
+        "textract": FakeTextract("textract", latency["textract"], failure_rate["textract"], rng),
+        "translate": FakeTranslate("translate", latency["translate"], failure_rate["translate"], rng),
+    })
+    app_module.s3_client = s3
+    app_module.transcribe_client = fakes["transcribe"]
+    app_module.polly_client = fakes["polly"]
+    app_module.comprehend_client = fakes["comprehend"]
+    app_module.textract_client = fakes["textract"]
+    app_module.aws_clients.update({"s3": s3, "transcribe": fakes["transcribe"], "polly": fakes["polly"],
+                                   "comprehend": fakes["comprehend"], "textract": fakes["textract"],
+                                   "translate": fakes["translate"]})
+
+    origin_files = {}
+    adapter = FakeHTTPAdapter(fakes["google"], fakes["origin"], origin_files)
+    app_module.http_session.mount("https://translate.googleapis.com/", adapter)
+    app_module.http_session.mount("http://origin.bench/", adapter)
+    return fakes, origin_files
+
+
+# -------------------------
+# Inputs
+# -------------------------
+def make_wav(seconds, seed):
+    """16 kHz mono tone; the seed changes the pitch so every input hashes differently."""
+    rate = 16000
+    frequency = 220 + seed % 500
+    frame = [struct.pack("<h", int(8000 * ((i * frequency * 2 // rate) % 2 * 2 - 1))) for i in range(rate // 10)]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(b"".join(frame) * int(seconds * 10))
+    return buffer.getvalue()
+
+
+def make_docx(paragraphs, seed):
+    import docx
+    rng = random.Random(seed)
+    document = docx.Document()
+    for index in range(paragraphs):
+        document.add_paragraph(f"{index + 1}. " + ". ".join(rng.choice(SENTENCES) for _ in range(3)) + ".")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_mp4(seconds, seed, workdir):
+    ffmpeg = shutil.which("ffmpeg")
+    path = os.path.join(workdir, f"input-{seed}.mp4")
+    subprocess.run([ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+                    "-f", "lavfi", "-i", f"testsrc=size=160x120:rate=10:duration={seconds}",
+                    "-f", "lavfi", "-i", f"sine=frequency={220 + seed % 500}:duration={seconds}",
+                    "-c:v", "mpeg4", "-c:a", "aac", "-shortest", path], check=True)
+    with open(path, "rb") as f:
+        data = f.read()
+    os.remove(path)
+    return data
+
+
+def make_input(route, index, args, workdir):
+    seed = index if args.reuse_inputs else random.Random(f"{route}-{index}-{time.time_ns()}").randrange(1 << 30)
+    if route == "audio":
+        return make_wav(args.media_seconds, seed)
+    if route == "document":
+        return make_docx(args.paragraphs, seed)
+    return make_mp4(args.media_seconds, seed, workdir)
+
+
+# -------------------------
+# Driver
+# -------------------------
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def run_request(app_module, route, index, data, args, origin_files):
+    endpoint, field, ext = ROUTES[route]
+    client = app_module.app.test_client()
+    form = {"source_lang": args.source_lang, "target_lang": args.target_lang}
+    if args.source == "url":
+        path = f"/{route}-{index}.{ext}"
+        origin_files[path] = data
+        form["file_url"] = f"http://origin.bench{path}"
+    else:
+        form[field] = (io.BytesIO(data), f"{route}-{index}.{ext}")
+
+    started = time.perf_counter()
+    response = client.post(endpoint, data=form, content_type="multipart/form-data")
+    location = response.headers.get("Location", "")
+    if "/jobs/" not in location:
+        return {"status": "rejected", "latency": time.perf_counter() - started}
+
+    job_id = location.rstrip("/").rsplit("/", 1)[1]
+    while True:
+        status = client.get(f"/jobs/{job_id}/status").get_json()
+        if status["status"] in ("completed", "failed"):
+            return {"status": status["status"], "latency": time.perf_counter() - started,
+                    "timings": status.get("timings") or {}, "error": status.get("error")}
+        time.sleep(args.poll_interval)
+
+
+def run_route(app_module, route, args, origin_files, workdir):
+    inputs = [make_input(route, index, args, workdir) for index in range(args.requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(lambda item: run_request(app_module, route, item[0], item[1], args, origin_files),
+                                 enumerate(inputs)))
+    wall = time.perf_counter() - started
+
+    completed = [outcome for outcome in outcomes if outcome["status"] == "completed"]
+    latencies = [outcome["latency"] for outcome in completed]
+    stages = {}
+    for outcome in completed:
+        for stage, seconds in outcome["timings"].items():
+            stages.setdefault(stage, []).append(seconds)
+    errors = sorted({outcome["error"] for outcome in outcomes if outcome.get("error")})
+    return {
+        "requests": len(outcomes),
+        "completed": len(completed),
+        "failed": sum(outcome["status"] == "failed" for outcome in outcomes),
+        "rejected": sum(outcome["status"] == "rejected" for outcome in outcomes),
+        "input_bytes": sum(len(data) for data in inputs) // max(1, len(inputs)),
+        "wall_seconds": round(wall, 3),
+        "throughput_per_s": round(len(completed) / wall, 3) if wall else 0.0,
+        "latency": {name: round(value, 4) if value is not None else None for name, value in (
+            ("p50", percentile(latencies, 0.50)),
+            ("p95", percentile(latencies, 0.95)),
+            ("p99", percentile(latencies, 0.99)),
+            ("mean", sum(latencies) / len(latencies) if latencies else None),
+            ("max", max(latencies) if latencies else None),
+        )},
+        "stages": {stage: {"p50": round(percentile(values, 0.50), 4), "p95": round(percentile(values, 0.95), 4),
+                           "mean": round(sum(values) / len(values), 4)}
+                   for stage, values in stages.items()},
+        "errors": errors[:10],
+    }
+
+
+def function_stages(app_module):
+    """Count and mean of every per-call stage histogram recorded during the run."""
+    with app_module.metrics.lock:
+        series = dict(app_module.metrics.histograms.get("languard_stage_duration_seconds", {}))
+    stages = {}
+    for labels, counts in series.items():
+        name = ",".join(f"{key}={value}" for key, value in labels)
+        count = sum(counts[:-1])
+        stages[name] = {"count": count, "mean": round(counts[-1] / count, 5) if count else None,
+                        "total": round(counts[-1], 4)}
+    return dict(sorted(stages.items()))
+
+
+# -------------------------
+# Results
+# -------------------------
+def git_revision():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return sha, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def load_results(reference):
+    path = reference if os.path.exists(reference) else None
+    if path is None and os.path.isdir(RESULTS_DIR):
+        matches = sorted(name for name in os.listdir(RESULTS_DIR) if name.startswith(reference))
+        path = os.path.join(RESULTS_DIR, matches[-1]) if matches else None
+    if path is None:
+        sys.exit(f"no benchmark results found for {reference}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def print_report(report):
+    print(f"commit {report['commit']}{' (dirty)' if report['dirty'] else ''}, "
+          f"concurrency {report['config']['concurrency']}, source {report['config']['source']}")
+    for route, result in report["routes"].items():
+        latency = result["latency"]
+        print(f"\n{route}: {result['completed']}/{result['requests']} completed, {result['failed']} failed, "
+              f"{result['rejected']} rejected in {result['wall_seconds']}s "
+              f"({result['throughput_per_s']} jobs/s)")
+        if latency["p50"] is not None:
+            print(f"  latency p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  p99 {latency['p99']:.3f}s")
+        for stage, values in result["stages"].items():
+            print(f"  {stage:<22} p50 {values['p50']:.3f}s  p95 {values['p95']:.3f}s")
+        for error in result["errors"]:
+            print(f"  error: {error}")
+    print("\nper-call stages (count, mean):")
+    for stage, values in report["function_stages"].items():
+        print(f"  {stage:<45} {values['count']:>6}  {values['mean'] * 1000:9.2f} ms")
+    print(f"\npeak RSS {report['peak_rss_mb']:.1f} MB (children {report['children_peak_rss_mb']:.1f} MB)")
+
+
+def print_comparison(base, current):
+    def change(old, new):
+        if old in (None, 0) or new is None:
+            return ""
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    print(f"\ncompared with {base['commit']}:")
+    for route, result in current["routes"].items():
+        old = base["routes"].get(route)
+        if not old:
+            continue
+        rows = [("throughput/s", old["throughput_per_s"], result["throughput_per_s"])]
+        rows += [(f"latency {name}", old["latency"][name], result["latency"][name]) for name in ("p50", "p95", "p99")]
+        rows += [(f"stage {stage} p95", old["stages"][stage]["p95"], values["p95"])
+                 for stage, values in result["stages"].items() if stage in old["stages"]]
+        print(f"  {route}")
+        for label, old_value, new_value in rows:
+            print(f"    {label:<24} {old_value!s:>10} -> {new_value!s:<10} {change(old_value, new_value)}")
+    print(f"  peak RSS MB              {base['peak_rss_mb']:>10} -> {current['peak_rss_mb']:<10} "
+          f"{change(base['peak_rss_mb'], current['peak_rss_mb'])}")
+
+
+def parse_overrides(values, defaults, convert=float):
+    settings = dict(defaults)
+    for value in values or []:
+        service, _, number = value.partition("=")
+        if service not in settings:
+            sys.exit(f"unknown service {service!r}; choose from {', '.join(settings)}")
+        settings[service] = convert(number)
+    return settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--routes", default="audio,document,video", help="comma-separated routes to drive")
+    parser.add_argument("--requests", type=int, default=20, help="jobs submitted per route")
+    parser.add_argument("--concurrency", type=int, default=4, help="clients submitting at once")
+    parser.add_argument("--source", choices=("upload", "url"), default="upload", help="upload files or submit URLs")
+    parser.add_argument("--media-seconds", type=float, default=30, help="length of generated audio/video")
+    parser.add_argument("--paragraphs", type=int, default=40, help="paragraphs per generated document")
+    parser.add_argument("--source-lang", default="auto")
+    parser.add_argument("--target-lang", default="es", help="a language with a Polly voice keeps TTS offline")
+    parser.add_argument("--reuse-inputs", action="store_true", help="same inputs every run (exercises the caches)")
+    parser.add_argument("--latency", action="append", metavar="SERVICE=SECONDS",
+                        help=f"fake latency override; services: {', '.join(DEFAULT_LATENCY)}")
+    parser.add_argument("--failure-rate", action="append", metavar="SERVICE=RATE", help="fake failure probability")
+    parser.add_argument("--poll-interval", type=float, default=0.02, help="seconds between job status checks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", metavar="REF", help="git sha prefix or results file to compare against")
+    parser.add_argument("--save", action="store_true", help="write the report to benchmarks/results/<sha>.json")
+    args = parser.parse_args()
+
+    latency = parse_overrides(args.latency, DEFAULT_LATENCY)
+    failure_rate = parse_overrides(args.failure_rate, DEFAULT_FAILURE_RATE)
+    routes = [route.strip() for route in args.routes.split(",") if route.strip()]
+    for route in routes:
+        if route not in ROUTES:
+            sys.exit(f"unknown route {route!r}")
+    if "video" in routes and not shutil.which("ffmpeg"):
+        print("ffmpeg not found; skipping the video route")
+        routes.remove("video")
+
+    # The app keeps uploads, outputs and caches relative to the working directory
+    workdir = tempfile.mkdtemp(prefix="languard-bench-")
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+    import app as app_module
+
+    if latency["transcribe"] is None:
+        latency["transcribe"] = app_module.TRANSCRIBE_SPEED_RATIO * args.media_seconds
+    fakes, origin_files = install_fakes(app_module, latency, failure_rate, args.seed)
+    results = {}
+    try:
+        for route in routes:
+            results[route] = run_route(app_module, route, args, origin_files, workdir)
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # ru_maxrss is in KB on Linux; read it before git runs as a child process
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children_peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    sha, dirty = git_revision()
+    report = {
+        "commit": sha,
+        "dirty": dirty,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("compare", "save")}
+        | {"latency": latency, "failure_rate": failure_rate},
+        "routes": results,
+        "function_stages": function_stages(app_module),
+        "fake_calls": {name: fake.calls for name, fake in fakes.items()},
+        "peak_rss_mb": round(peak_rss, 1),
+        "children_peak_rss_mb": round(children_peak_rss, 1),
+    }
+    print_report(report)
+
+    if args.compare:
+        print_comparison(load_results(args.compare), report)
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{sha}{'-dirty' if dirty else ''}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nsaved {os.path.relpath(path, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
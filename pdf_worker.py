@@ -0,0 +1,30 @@
+# pdf_worker.py - PDF text extraction run on app.py's process pool
+#
+# Spawned workers import only this module, so keep it free of app imports:
+# importing app would open its databases, AWS clients and executors in every worker.
+import PyPDF2
+
+
+def extract_pdf_range(task):
+    """Process-pool worker: [(text, is_scanned)] for pages start..end-1."""
+    pdf_path, start, end = task
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        pages = []
+        for index in range(start, end):
+            page = reader.pages[index]
+            text = page.extract_text() or ""
+            pages.append((text, not text.strip() and pdf_page_has_images(page)))
+        return pages
+
+
+def pdf_page_has_images(page):
+    try:
+        resources = page.get("/Resources")
+        xobjects = resources.get_object().get("/XObject") if resources else None
+        if not xobjects:
+            return False
+        return any(xobject.get_object().get("/Subtype") == "/Image"
+                   for xobject in xobjects.get_object().values())
+    except Exception:
+        return False
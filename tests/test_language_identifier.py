@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+import app
+
+
+SHORT_INPUTS = [
+    ('ms', "terima kasih"),
+    ('ms', "selamat pagi"),
+    ('ms', "apa khabar"),
+    ('ms', "saya tidak faham"),
+    ('en', "thank you"),
+    ('en', "where is the toilet"),
+    ('es', "gracias"),
+    ('es', "buenos días"),
+    ('es', "dónde está el baño"),
+    ('de', "guten Morgen"),
+    ('de', "danke schön"),
+    ('de', "wo ist der Bahnhof"),
+    ('fr', "merci beaucoup"),
+    ('fr', "je ne comprends pas"),
+    ('pt', "obrigado"),
+    ('pt', "onde fica o banheiro"),
+    ('it', "grazie mille"),
+    ('it', "non capisco"),
+]
+
+
+@pytest.mark.parametrize('expected, text', SHORT_INPUTS)
+def test_short_common_inputs_resolve_locally(monkeypatch, expected, text):
+    def comprehend(text):
+        raise AssertionError("Comprehend should not be asked")
+
+    monkeypatch.setattr(app, 'detect_language_comprehend', comprehend)
+    lang_code, lang_name, confidence = app.detect_language(text)
+    assert lang_code == expected
+    assert confidence >= app.LANGUAGE_ID_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize('text', ["por favor", "hotel", "Kuala Lumpur"])
+def test_ambiguous_short_inputs_stay_unsure(text):
+    lang_code, confidence = app.language_identifier.identify(text)
+    assert confidence < app.LANGUAGE_ID_MIN_CONFIDENCE
+
+
+def test_identifier_scores_only_its_own_sample():
+    head = "terima kasih banyak, selamat pagi semua. "
+    head = head * (app.LANGUAGE_ID_SAMPLE_CHARS // len(head) + 1)
+    text = head + app.LANGUAGE_ID_SEED_TEXT['de'] * 50
+    assert app.LANGUAGE_ID_SAMPLE_CHARS < app.LANGUAGE_DETECTION_SAMPLE_CHARS
+    assert app.language_identifier.identify(text)[0] == 'ms'
+
+
+def test_identifier_is_fast_on_long_input():
+    text = app.LANGUAGE_ID_SEED_TEXT['de'] * 50
+    best = float('inf')
+    for _ in range(20):
+        started = time.perf_counter()
+        app.language_identifier.identify(text)
+        best = min(best, time.perf_counter() - started)
+    assert best < 0.001